@@ -0,0 +1,189 @@
+import asyncio
+import calendar
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Forecast-cache in twee lagen: een LRU in het geheugen en een laag op disk.
+# Sleutel = lat/lon afgerond op een grid (standaard 0.1°, ~11 km); alleen metric data,
+# imperial wordt per request omgerekend.
+# Een forecast blijft geldig tot het volgende upstream-interval: current.time + interval
+# (900s in data.json). Beide lagen worden op bytes begrensd, zodat de gateway ruim
+# binnen de 128Mi geheugenlimiet van de pod blijft.
+# De disklaag leest en schrijft in een worker-thread (asyncio.to_thread): een trage
+# disk houdt zo nooit de event loop, en daarmee alle lopende requests, op.
+
+DEFAULT_GRID_DEG = 0.1
+DEFAULT_MEMORY_BYTES = 32 * 1024 * 1024
+DEFAULT_DISK_BYTES = 256 * 1024 * 1024
+DEFAULT_INTERVAL = 900
+MIN_TTL = 60
+
+def snap(value, grid):
+    # Middelpunt van de gridcel, met vaste afronding zodat dezelfde cel dezelfde sleutel geeft
+    return round((int(value // grid) + 0.5) * grid, 6)
+
+def cell_key(lat, lon, grid=DEFAULT_GRID_DEG):
+    return f"{snap(float(lat), grid):.6f},{snap(float(lon), grid):.6f}"
+
+def expires_at(forecast, now=None):
+    # current.time is lokale tijd (utc_offset_seconds); de data ververst na `interval` seconden
+    now = time.time() if now is None else now
+    current = forecast.get("current") or forecast.get("current_weather") or {}
+    interval = current.get("interval") or DEFAULT_INTERVAL
+    try:
+        start = calendar.timegm(time.strptime(current["time"], "%Y-%m-%dT%H:%M")) - forecast.get("utc_offset_seconds", 0)
+    except (KeyError, TypeError, ValueError):
+        return now + interval
+    expiry = start + interval
+    # Klokverschil of een oud antwoord: nooit korter dan MIN_TTL, nooit langer dan één interval
+    return min(max(expiry, now + MIN_TTL), now + interval)
+
+class MemoryTier:
+    def __init__(self, max_bytes=DEFAULT_MEMORY_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.entries = OrderedDict()
+        self.evictions = 0
+
+    def get(self, key, now):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            self._drop(key)
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, expiry, body):
+        if len(body) > self.max_bytes:
+            return
+        if key in self.entries:
+            self._drop(key)
+        self.entries[key] = (expiry, body)
+        self.bytes += len(body)
+        while self.bytes > self.max_bytes:
+            self._drop(next(iter(self.entries)))
+            self.evictions += 1
+
+    def _drop(self, key):
+        _, body = self.entries.pop(key)
+        self.bytes -= len(body)
+
+class DiskTier:
+    # Eén bestand per sleutel: eerste regel = verlooptijd (epoch), daarna de JSON-body
+    def __init__(self, root, max_bytes=DEFAULT_DISK_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.files = OrderedDict()
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        # Bestaande bestanden overnemen, oudste eerst (evictie-volgorde)
+        existing = []
+        for name in os.listdir(root):
+            if name.endswith(".fc"):
+                stat = os.stat(os.path.join(root, name))
+                existing.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(existing):
+            self.files[name] = size
+            self.bytes += size
+
+    def _name(self, key):
+        return hashlib.sha1(key.encode("utf-8")).hexdigest() + ".fc"
+
+    def get(self, key, now):
+        name = self._name(key)
+        if name not in self.files:
+            return None
+        try:
+            with open(os.path.join(self.root, name), "rb") as f:
+                expiry = float(f.readline())
+                body = f.read()
+        except (OSError, ValueError):
+            self._remove(name)
+            return None
+        if expiry <= now:
+            self._remove(name)
+            return None
+        return expiry, body
+
+    def put(self, key, expiry, body):
+        name = self._name(key)
+        data = b"%.3f\n" % expiry + body
+        if len(data) > self.max_bytes:
+            return
+        path = os.path.join(self.root, name)
+        # Atomisch: eerst een tijdelijk bestand (uniek per thread), dan os.replace
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        with self._lock:
+            # replace onder de lock: bestand en byte-telling blijven bij gelijktijdige puts gelijk
+            os.replace(tmp, path)
+            self.bytes += len(data) - self.files.pop(name, 0)
+            self.files[name] = len(data)
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self.files)), locked=True)
+                self.evictions += 1
+
+    def _remove(self, name, locked=False):
+        if not locked:
+            with self._lock:
+                return self._remove(name, locked=True)
+        self.bytes -= self.files.pop(name, 0)
+        try:
+            os.remove(os.path.join(self.root, name))
+        except OSError:
+            pass
+
+class ForecastCache:
+    def __init__(self, grid=DEFAULT_GRID_DEG, memory_bytes=DEFAULT_MEMORY_BYTES, disk_dir=None,
+                 disk_bytes=DEFAULT_DISK_BYTES):
+        self.grid = grid
+        self.memory = MemoryTier(memory_bytes)
+        self.disk = DiskTier(disk_dir, disk_bytes) if disk_dir else None
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+
+    def key(self, lat, lon):
+        return cell_key(lat, lon, self.grid)
+
+    def cell(self, lat, lon):
+        # Coördinaten waarvoor de forecast wordt opgehaald: het midden van de cel
+        return snap(float(lat), self.grid), snap(float(lon), self.grid)
+
+    async def get(self, key, now=None):
+        # Geeft de JSON-body (bytes) terug, of None
+        now = time.time() if now is None else now
+        entry = self.memory.get(key, now)
+        if entry is not None:
+            self.counters["memory_hits"] += 1
+            return entry[1]
+        if self.disk is not None:
+            entry = await asyncio.to_thread(self.disk.get, key, now)
+            if entry is not None:
+                self.counters["disk_hits"] += 1
+                self.memory.put(key, *entry)
+                return entry[1]
+        self.counters["misses"] += 1
+        return None
+
+    async def put(self, key, forecast, body, now=None):
+        expiry = expires_at(forecast, now)
+        self.counters["stores"] += 1
+        self.memory.put(key, expiry, body)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.put, key, expiry, body)
+        return expiry
+
+    def stats(self):
+        stats = dict(self.counters, memory_bytes=self.memory.bytes, memory_entries=len(self.memory.entries),
+                     memory_evictions=self.memory.evictions, grid_deg=self.grid)
+        if self.disk is not None:
+            stats.update(disk_bytes=self.disk.bytes, disk_entries=len(self.disk.files),
+                         disk_evictions=self.disk.evictions)
+        return stats
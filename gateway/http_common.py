@@ -0,0 +1,26 @@
+# Gedeelde HTTP/1.1-bouwstenen voor de weather-gateway en de weather-stub
+# (tests/weather_stub.py): één plek voor het antwoordformaat en de event loop-keuze.
+
+REASONS = {200: b"OK", 400: b"Bad Request", 404: b"Not Found", 405: b"Method Not Allowed",
+           431: b"Request Header Fields Too Large", 502: b"Bad Gateway"}
+
+def http_response(status, body, keep_alive=True, content_type=b"application/json", headers=b""):
+    # Volledig antwoord als bytes; `headers` = extra, al geformatteerde regels ("Naam: waarde\r\n")
+    return b"".join((
+        b"HTTP/1.1 %d %s\r\n" % (status, REASONS.get(status, b"OK")),
+        b"Content-Type: " + content_type + b"\r\n",
+        headers,
+        b"Content-Length: %d\r\n" % len(body),
+        b"Connection: keep-alive\r\n" if keep_alive else b"Connection: close\r\n",
+        b"\r\n",
+        body,
+    ))
+
+def install_fast_loop():
+    # uvloop is optioneel; zonder draait de server op de standaard event loop
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    uvloop.install()
+    return True
@@ -0,0 +1,107 @@
+import bisect
+import calendar
+import math
+import time
+
+# Render-klare forecast (?view=render): alleen wat index.html toont, met iconen al
+# opgezocht. renderHourlyForecast() zoekt het huidige uur lineair met new Date() over
+# alle 168 tijden; hier worden de tijden één keer naar epoch-seconden omgezet en wordt
+# de startindex met bisect gevonden. Daarna: 8 uren en 7 dagen, zoals de UI ze rendert.
+
+HOURS = 8
+DAYS = 7
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# Zelfde mapping als getWeatherIconName() in script.js
+WEATHER_ICONS = {
+    0: "sunny", 1: "partly-cloudy", 2: "partly-cloudy", 3: "overcast", 45: "fog", 48: "fog",
+    51: "drizzle", 53: "drizzle", 55: "drizzle", 56: "drizzle", 57: "drizzle",
+    61: "rain", 63: "rain", 65: "rain", 66: "rain", 67: "rain", 80: "rain", 81: "rain", 82: "rain",
+    71: "snow", 73: "snow", 75: "snow", 77: "snow", 85: "snow", 86: "snow",
+    95: "storm", 96: "storm", 99: "storm",
+}
+
+def icon_for(code):
+    return f"icon-{WEATHER_ICONS.get(code, 'overcast')}.webp"
+
+def js_round(value):
+    # Math.round: .5 naar boven (Python's round() rondt naar even)
+    return None if value is None else int(math.floor(value + 0.5))
+
+def epoch(timestamp):
+    # Open-Meteo tijden zijn lokaal ("2026-01-17T22:00" of "2026-01-17"); epoch als waren ze UTC,
+    # zodat alles binnen één antwoord onderling vergelijkbaar blijft
+    # Vaste ISO-posities; veel sneller dan strptime voor 168 tijden per request
+    hour, minute = (int(timestamp[11:13]), int(timestamp[14:16])) if len(timestamp) >= 16 else (0, 0)
+    return calendar.timegm((int(timestamp[0:4]), int(timestamp[5:7]), int(timestamp[8:10]), hour, minute, 0))
+
+def start_index(hourly_times, now):
+    # Eerste uur >= now, zoals de for-lus in renderHourlyForecast() (geen match -> 0)
+    epochs = [epoch(t) for t in hourly_times]
+    index = bisect.bisect_left(epochs, epoch(now))
+    return (index if index < len(epochs) else 0), epochs
+
+def _at(values, index):
+    return values[index] if values and index < len(values) else None
+
+def render_payload(forecast):
+    hourly, daily = forecast.get("hourly") or {}, forecast.get("daily") or {}
+    current = forecast.get("current_weather") or {}
+    hourly_units = forecast.get("hourly_units") or {}
+    times = hourly.get("time") or []
+    now = current.get("time") or (times[0] if times else None)
+    first, epochs = start_index(times, now) if times and now else (0, [])
+
+    temperature = current.get("temperature")
+    weathercode = current.get("weathercode")
+    feels_like = _at(hourly.get("apparent_temperature"), first)
+    temperature_unit = (forecast.get("current_weather_units") or {}).get("temperature", "°C")
+    imperial = temperature_unit == "°F"
+    payload = {
+        "units": {
+            "temperature": temperature_unit,
+            "windspeed": (forecast.get("current_weather_units") or {}).get("windspeed", "mph" if imperial else "km/h"),
+            "precipitation": hourly_units.get("precipitation") or (forecast.get("current_units") or {}).get(
+                "precipitation", "inch" if imperial else "mm"),
+        },
+        "current": {
+            "time": now,
+            "temperature": js_round(temperature),
+            "windspeed": js_round(current.get("windspeed")),
+            "feels_like": js_round(temperature if feels_like is None else feels_like),
+            "humidity": js_round(_at(hourly.get("relative_humidity_2m"), first)),
+            "precipitation": js_round(_at(hourly.get("precipitation"), first)),
+            "icon": icon_for(weathercode),
+        },
+        "hourly": [],
+        "daily": [],
+    }
+    if "name" in forecast:
+        payload["location"] = {"name": forecast["name"], "country": forecast.get("sys", {}).get("country"),
+                               **forecast.get("coord", {})}
+
+    now_epoch = epoch(now) if now else None
+    for i in range(first, min(first + HOURS, len(times))):
+        hour = int(times[i][11:13])
+        payload["hourly"].append({
+            "time": times[i],
+            "label": f"{hour % 12 or 12}:00 {'PM' if hour >= 12 else 'AM'}",
+            "temperature": js_round(_at(hourly.get("temperature_2m"), i)),
+            "icon": icon_for(_at(hourly.get("weather_code"), i)),
+            # Zelfde uur als current_weather.time -> class "current" in de UI
+            "current": now_epoch is not None and epochs[i] // 3600 == now_epoch // 3600,
+        })
+    if payload["hourly"]:
+        payload["hourly_day"] = WEEKDAYS[time.gmtime(epochs[first]).tm_wday]
+
+    for i, date in enumerate((daily.get("time") or [])[:DAYS]):
+        # Dag 0 toont in renderDailyForecast() de huidige temperatuur en het huidige icoon
+        today = i == 0
+        payload["daily"].append({
+            "date": date,
+            "weekday": WEEKDAYS[time.gmtime(epoch(date)).tm_wday][:3],
+            "max": js_round(temperature if today else _at(daily.get("temperature_2m_max"), i)),
+            "min": js_round(temperature if today else _at(daily.get("temperature_2m_min"), i)),
+            "icon": icon_for(weathercode if today else _at(daily.get("weather_code"), i)),
+        })
+    return payload
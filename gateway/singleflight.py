@@ -0,0 +1,38 @@
+import asyncio
+
+# Single-flight: gelijktijdige aanvragen voor dezelfde sleutel delen één upstream-call.
+# De eerste aanvrager (leader) voert de call uit; wie binnenkomt terwijl die loopt
+# wacht op hetzelfde resultaat (of dezelfde fout). Na afloop is de sleutel weer vrij,
+# caching is dus een aparte laag.
+
+class SingleFlight:
+    def __init__(self):
+        self._inflight = {}
+        self.counters = {"leaders": 0, "coalesced": 0, "errors": 0}
+
+    async def do(self, key, call):
+        future = self._inflight.get(key)
+        if future is not None:
+            self.counters["coalesced"] += 1
+            # shield: een afgebroken wachter mag de gedeelde call niet annuleren
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.counters["leaders"] += 1
+        try:
+            result = await call()
+        except BaseException as e:
+            self.counters["errors"] += 1
+            future.set_exception(e)
+            # Voorkomt "exception was never retrieved" als er geen wachters waren
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    def stats(self):
+        return dict(self.counters, inflight=len(self._inflight))
@@ -0,0 +1,54 @@
+# Metric -> imperial voor een Open-Meteo forecast, zoals script.js die bij "F" opvraagt
+# (fahrenheit / mph / inch). De gateway haalt en cachet alleen metric data; bij "F"
+# worden alle hourly/daily/current-velden in één pass per eenheid omgerekend:
+# alle arrays met dezelfde eenheid achter elkaar in één NumPy-array, omrekenen, terugknippen.
+# Welke velden omgerekend worden volgt uit de *_units-blokken van het antwoord zelf.
+
+CONVERSIONS = {
+    # metric-eenheid: (imperial-eenheid, factor, offset, decimalen)
+    "°C": ("°F", 9 / 5, 32.0, 1),
+    "km/h": ("mph", 1 / 1.609344, 0.0, 1),
+    "mm": ("inch", 1 / 25.4, 0.0, 3),
+}
+BLOCKS = ("hourly", "daily", "current", "current_weather")
+
+def _segments(forecast):
+    # Per eenheid: lijst van (blok, veld, waarde-of-lijst)
+    segments = {}
+    for block in BLOCKS:
+        data, units = forecast.get(block), forecast.get(f"{block}_units")
+        if not isinstance(data, dict) or not isinstance(units, dict):
+            continue
+        for field, unit in units.items():
+            if unit in CONVERSIONS and field in data:
+                segments.setdefault(unit, []).append((block, field))
+    return segments
+
+def _flatten(values):
+    return values if isinstance(values, list) else [values]
+
+def to_imperial(forecast):
+    # Past `forecast` in place aan en geeft hem terug
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    for unit, fields in _segments(forecast).items():
+        imperial, factor, offset, decimals = CONVERSIONS[unit]
+        chunks = [_flatten(forecast[block][field]) for block, field in fields]
+        flat = [v for chunk in chunks for v in chunk]
+        if np is not None:
+            # None (ontbrekende meting) wordt NaN en daarna weer None
+            converted = np.round(np.array(flat, dtype=float) * factor + offset, decimals).tolist()
+            converted = [None if v != v else v for v in converted]
+        else:
+            converted = [None if v is None else round(v * factor + offset, decimals) for v in flat]
+
+        position = 0
+        for (block, field), chunk in zip(fields, chunks):
+            values = converted[position:position + len(chunk)]
+            position += len(chunk)
+            forecast[block][field] = values if isinstance(forecast[block][field], list) else values[0]
+            forecast[f"{block}_units"][field] = imperial
+    return forecast
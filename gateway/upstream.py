@@ -0,0 +1,144 @@
+import asyncio
+import ssl
+import time
+from urllib.parse import urlsplit
+
+# Asyncio HTTP/1.1-client met keep-alive pool per upstream-host.
+# Idle verbindingen worden hergebruikt (geen nieuwe TCP/TLS-handshake per call);
+# een verbinding die de server intussen heeft gesloten wordt één keer opnieuw geprobeerd.
+
+IDLE_TIMEOUT = 30.0
+MAX_HEADER_BYTES = 64 * 1024
+
+class UpstreamError(Exception):
+    pass
+
+class UpstreamResponse:
+    def __init__(self, status, headers, body, timings):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.timings = timings
+
+class AsyncHttpPool:
+    def __init__(self, max_per_host=8, timeout=10.0, user_agent="weather-gateway"):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self._idle = {}
+        self._limits = {}
+        self._ssl = None
+        self.stats = {"requests": 0, "connects": 0, "reused": 0, "retries": 0}
+
+    def _ssl_context(self):
+        if self._ssl is None:
+            self._ssl = ssl.create_default_context()
+        return self._ssl
+
+    async def _connect(self, key):
+        scheme, host, port = key
+        self.stats["connects"] += 1
+        return await asyncio.open_connection(host, port, ssl=self._ssl_context() if scheme == "https" else None)
+
+    def _take_idle(self, key):
+        idle = self._idle.get(key)
+        now = time.monotonic()
+        while idle:
+            reader, writer, since = idle.pop()
+            if now - since < IDLE_TIMEOUT and not writer.is_closing() and not reader.at_eof():
+                return reader, writer
+            writer.close()
+        return None
+
+    async def get(self, url, headers=None, timeout=None):
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        key = (scheme, parts.hostname, parts.port or (443 if scheme == "https" else 80))
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        lines = [f"GET {target} HTTP/1.1", f"Host: {parts.netloc}", f"User-Agent: {self.user_agent}",
+                 "Accept: application/json", "Accept-Encoding: identity", "Connection: keep-alive"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        limit = self._limits.setdefault(key, asyncio.Semaphore(self.max_per_host))
+        async with limit:
+            self.stats["requests"] += 1
+            return await asyncio.wait_for(self._exchange(key, request), timeout or self.timeout)
+
+    async def _exchange(self, key, request):
+        start = time.perf_counter()
+        conn = self._take_idle(key)
+        reused = conn is not None
+        if not reused:
+            conn = await self._connect(key)
+        connected = time.perf_counter()
+        try:
+            try:
+                status, headers, body, keep_alive, ttfb = await self._roundtrip(conn, request)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                conn[1].close()
+                if not reused:
+                    raise UpstreamError(f"{key[1]}: {e}") from e
+                # Keep-alive verbinding was al dicht aan de serverkant: één nieuwe poging
+                self.stats["retries"] += 1
+                conn = await self._connect(key)
+                connected = time.perf_counter()
+                status, headers, body, keep_alive, ttfb = await self._roundtrip(conn, request)
+        except BaseException:
+            # Timeout/cancel (wait_for), parse-fouten of een mislukte retry: een half gelezen
+            # verbinding nooit laten lekken of terug in de pool zetten
+            conn[1].close()
+            raise
+        if reused:
+            self.stats["reused"] += 1
+
+        if keep_alive:
+            self._idle.setdefault(key, []).append((conn[0], conn[1], time.monotonic()))
+        else:
+            conn[1].close()
+        end = time.perf_counter()
+        timings = {"connect_ms": round((connected - start) * 1000, 3), "ttfb_ms": round((ttfb - start) * 1000, 3),
+                   "total_ms": round((end - start) * 1000, 3)}
+        return UpstreamResponse(status, headers, body, timings)
+
+    async def _roundtrip(self, conn, request):
+        reader, writer = conn
+        writer.write(request)
+        await writer.drain()
+        head = await reader.readuntil(b"\r\n\r\n")
+        ttfb = time.perf_counter()
+        if len(head) > MAX_HEADER_BYTES:
+            raise UpstreamError("upstream headers te groot")
+        status_line, *header_lines = head[:-4].decode("latin-1").split("\r\n")
+        version, status = status_line.split(" ", 2)[:2]
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0].strip(), 16)
+                if size == 0:
+                    await reader.readuntil(b"\r\n")
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            # Geen lengte: body loopt tot de server de verbinding sluit
+            body = await reader.read()
+            headers["connection"] = "close"
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return int(status), headers, body, keep_alive, ttfb
+
+    def close(self):
+        for idle in self._idle.values():
+            for _, writer, _ in idle:
+                writer.close()
+        self._idle.clear()
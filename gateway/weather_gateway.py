@@ -0,0 +1,289 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+from urllib.parse import parse_qs, quote, unquote_plus, urlsplit
+
+from forecast_cache import DEFAULT_DISK_BYTES, DEFAULT_GRID_DEG, DEFAULT_MEMORY_BYTES, ForecastCache
+from http_common import http_response, install_fast_loop
+from singleflight import SingleFlight
+from render import render_payload
+from units import to_imperial
+from upstream import AsyncHttpPool, UpstreamError
+
+# Weather-gateway: stad -> Nominatim -> Open-Meteo in één request van de browser.
+# De browser doet zo één round trip naar de gateway in plaats van twee achter elkaar
+# naar derden; de gateway houdt keep-alive verbindingen naar beide upstreams open.
+# Het antwoord is de Open-Meteo forecast (daily/hourly/current_weather, zoals
+# renderDailyForecast/renderHourlyForecast in script.js verwachten) plus de locatie.
+
+NOMINATIM_URL = os.getenv("NOMINATIM_URL", "https://nominatim.openstreetmap.org")
+OPEN_METEO_URL = os.getenv("OPEN_METEO_URL", "https://api.open-meteo.com")
+USER_AGENT = os.getenv("GATEWAY_USER_AGENT", "weather-app-gateway/1.0")
+log = logging.getLogger("weather-gateway")
+# Forecast-cache; FORECAST_CACHE_DIR leeg = alleen de geheugenlaag
+FORECAST_GRID_DEG = float(os.getenv("FORECAST_GRID_DEG", str(DEFAULT_GRID_DEG)))
+FORECAST_CACHE_BYTES = int(os.getenv("FORECAST_CACHE_BYTES", str(DEFAULT_MEMORY_BYTES)))
+FORECAST_CACHE_DIR = os.getenv("FORECAST_CACHE_DIR", "/tmp/weather-gateway/forecasts")
+FORECAST_DISK_BYTES = int(os.getenv("FORECAST_DISK_BYTES", str(DEFAULT_DISK_BYTES)))
+
+# Zelfde keuze als getGeoData(): eerst een resultaat uit deze landen, anders het eerste
+PRIORITY_COUNTRY_CODES = ("gr", "nl", "de", "fr", "gb", "es", "it", "no", "be", "at")
+# Zelfde volgorde als loadLocationData() voor de stadsnaam
+CITY_KEYS = ("city", "town", "village", "municipality", "suburb", "city_district", "county",
+             "state_district", "state", "province", "region")
+HOURLY_FIELDS = "temperature_2m,apparent_temperature,relative_humidity_2m,precipitation,wind_speed_10m,weather_code"
+DAILY_FIELDS = "temperature_2m_max,temperature_2m_min,weather_code"
+# Upstream altijd metric; "F" wordt in de gateway omgerekend (zie units.py)
+METRIC_PARAMS = {"temperature_unit": "celsius", "wind_speed_unit": "kmh", "precipitation_unit": "mm"}
+UNITS = ("C", "F")
+# view=full: complete Open-Meteo forecast; view=render: alleen wat de UI toont (render.py)
+VIEWS = ("full", "render")
+
+MAX_HEADER_BYTES = 64 * 1024
+CORS_HEADER = b"Access-Control-Allow-Origin: *\r\n"
+
+class NotFound(Exception):
+    pass
+
+def select_place(results):
+    for place in results:
+        code = (place.get("address") or {}).get("country_code", "")
+        if code.lower() in PRIORITY_COUNTRY_CODES:
+            return place
+    return results[0] if results else None
+
+def city_name(place):
+    address = place.get("address") or {}
+    for key in CITY_KEYS:
+        if address.get(key):
+            return address[key]
+    return place.get("name") or "Unknown location"
+
+def forecast_url(base, lat, lon):
+    params = {"latitude": lat, "longitude": lon, "current_weather": "true", "hourly": HOURLY_FIELDS,
+              "daily": DAILY_FIELDS, **METRIC_PARAMS, "timezone": "auto"}
+    return f"{base}/v1/forecast?" + "&".join(f"{k}={v}" for k, v in params.items())
+
+def normalize_forecast(forecast):
+    # script.js leest current_weather; nieuwere Open-Meteo antwoorden (zoals data.json) hebben `current`
+    current = forecast.get("current")
+    if "current_weather" not in forecast and current:
+        forecast["current_weather"] = {
+            "time": current.get("time"),
+            "temperature": current.get("temperature_2m"),
+            "windspeed": current.get("wind_speed_10m"),
+            "weathercode": current.get("weather_code"),
+            "interval": current.get("interval"),
+        }
+        units = forecast.get("current_units") or {}
+        forecast["current_weather_units"] = {
+            "time": units.get("time", "iso8601"),
+            "temperature": units.get("temperature_2m", "°C"),
+            "windspeed": units.get("wind_speed_10m", "km/h"),
+            "weathercode": units.get("weather_code", "wmo code"),
+            "interval": units.get("interval", "seconds"),
+        }
+    return forecast
+
+class WeatherGateway:
+    def __init__(self, pool, nominatim_url=NOMINATIM_URL, open_meteo_url=OPEN_METEO_URL, cache=None, coalesce=True):
+        self.pool = pool
+        self.nominatim_url = nominatim_url.rstrip("/")
+        self.open_meteo_url = open_meteo_url.rstrip("/")
+        self.cache = cache
+        # Gelijktijdige identieke geocode-/forecast-lookups delen één upstream-call
+        self.flights = {"geocode": SingleFlight(), "forecast": SingleFlight()} if coalesce else None
+        self.stats = {"requests": 0, "errors": 0}
+
+    async def _get_json(self, url):
+        response = await self.pool.get(url)
+        if response.status != 200:
+            raise UpstreamError(f"{urlsplit(url).hostname} gaf HTTP {response.status}")
+        return json.loads(response.body)
+
+    async def _shared(self, kind, key, call):
+        if self.flights is None:
+            return await call()
+        return await self.flights[kind].do(key, call)
+
+    async def geocode(self, city):
+        # Genormaliseerde zoekterm: "  new  YORK" en "new york" delen dezelfde call.
+        # Het gedeelde resultaat wordt alleen gelezen, nooit aangepast.
+        query = " ".join(city.lower().split())
+        return await self._shared("geocode", query, lambda: self._fetch_place(query))
+
+    async def _fetch_place(self, query):
+        results = await self._get_json(f"{self.nominatim_url}/search?q={quote(query)}&format=jsonv2&addressdetails=1")
+        place = select_place(results or [])
+        if not place or not place.get("lat") or not place.get("lon"):
+            raise NotFound(query)
+        return place
+
+    async def forecast(self, lat, lon, units="C"):
+        # Intern als metric JSON-bytes: elke aanvrager krijgt zo een eigen kopie om aan te vullen
+        forecast = json.loads(await self._forecast_body(lat, lon))
+        return to_imperial(forecast) if units == "F" else forecast
+
+    async def _forecast_body(self, lat, lon):
+        if self.cache is None:
+            key = f"{float(lat):.6f},{float(lon):.6f}"
+            return await self._shared("forecast", key, lambda: self._fetch_forecast(None, lat, lon))
+
+        # Cache-hit = opgeslagen JSON; bij een miss de forecast voor het midden
+        # van de gridcel ophalen, zodat de hele cel hetzelfde antwoord deelt
+        key = self.cache.key(lat, lon)
+        body = await self.cache.get(key)
+        if body is not None:
+            return body
+        cell_lat, cell_lon = self.cache.cell(lat, lon)
+        return await self._shared("forecast", key, lambda: self._fetch_forecast(key, cell_lat, cell_lon))
+
+    async def _fetch_forecast(self, key, lat, lon):
+        forecast = normalize_forecast(await self._get_json(forecast_url(self.open_meteo_url, lat, lon)))
+        body = json.dumps(forecast).encode("utf-8")
+        if key is not None:
+            await self.cache.put(key, forecast, body)
+        return body
+
+    async def weather(self, city, units="C"):
+        place = await self.geocode(city)
+        body = await self.forecast(place["lat"], place["lon"], units)
+        country = (place.get("address") or {}).get("country_code", "")
+        body.update({
+            "name": city_name(place),
+            "coord": {"lat": float(place["lat"]), "lon": float(place["lon"])},
+            "sys": {"country": country.upper() or "UNKNOWN"},
+            "location": place,
+        })
+        return body
+
+    async def handle(self, method, target):
+        # Geeft (status, body-dict) terug
+        if method not in ("GET", "HEAD"):
+            return 405, {"error": "method not allowed"}
+        parts = urlsplit(target)
+        query = parse_qs(parts.query)
+
+        if parts.path == "/health":
+            return 200, {"status": "ok"}
+        if parts.path == "/stats":
+            stats = {"gateway": self.stats, "upstream": self.pool.stats}
+            if self.cache is not None:
+                stats["forecast_cache"] = self.cache.stats()
+            if self.flights is not None:
+                stats["coalescing"] = {kind: flight.stats() for kind, flight in self.flights.items()}
+            return 200, stats
+        if parts.path != "/weather":
+            return 404, {"error": "not found"}
+
+        # ?city= doet geocode + forecast; ?lat=&lon= alleen de forecast (unit-wissel in de UI)
+        city = unquote_plus(query.get("city", [""])[0]).strip()
+        units = query.get("units", ["C"])[0].upper()
+        view = query.get("view", ["full"])[0].lower()
+        if units not in UNITS:
+            return 400, {"error": f"units must be one of {', '.join(UNITS)}"}
+        if view not in VIEWS:
+            return 400, {"error": f"view must be one of {', '.join(VIEWS)}"}
+        if not city:
+            try:
+                lat, lon = float(query["lat"][0]), float(query["lon"][0])
+            except (KeyError, ValueError):
+                return 400, {"error": "city or lat/lon is required"}
+        try:
+            if city:
+                body = await self.weather(city, units)
+            else:
+                body = await self.forecast(lat, lon, units)
+                body["coord"] = {"lat": lat, "lon": lon}
+            return 200, render_payload(body) if view == "render" else body
+        except NotFound:
+            return 404, {"error": "City not found"}
+        except (UpstreamError, OSError, asyncio.TimeoutError, ValueError) as e:
+            self.stats["errors"] += 1
+            return 502, {"error": f"upstream: {e or type(e).__name__}"}
+        except Exception as e:
+            # Onverwacht antwoord (bv. KeyError/TypeError op een gewijzigde upstream-payload):
+            # loggen en een 502, in plaats van de verbinding zonder antwoord te laten vallen
+            self.stats["errors"] += 1
+            log.exception("onverwachte fout voor %s", target)
+            return 502, {"error": f"upstream: {type(e).__name__}"}
+
+def json_response(status, payload, keep_alive=True, head_only=False):
+    response = http_response(status, json.dumps(payload).encode("utf-8"), keep_alive, headers=CORS_HEADER)
+    return response[:response.find(b"\r\n\r\n") + 4] if head_only else response
+
+async def serve_connection(gateway, reader, writer):
+    # Eén request tegelijk per verbinding, keep-alive tot de client sluit
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                return
+            lines = head[:-4].decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                writer.write(json_response(400, {"error": "bad request"}, keep_alive=False))
+                return
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip().lower()
+            if headers.get("content-length", "0").isdigit() and int(headers.get("content-length", "0")):
+                await reader.readexactly(int(headers["content-length"]))
+
+            connection = headers.get("connection", "")
+            keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+            gateway.stats["requests"] += 1
+            status, payload = await gateway.handle(method, target)
+            writer.write(json_response(status, payload, keep_alive, head_only=(method == "HEAD")))
+            await writer.drain()
+            if not keep_alive:
+                return
+    finally:
+        writer.close()
+
+async def serve(host="127.0.0.1", port=8081, gateway=None, pool_size=8, timeout=10.0):
+    gateway = gateway or WeatherGateway(AsyncHttpPool(max_per_host=pool_size, timeout=timeout, user_agent=USER_AGENT))
+    server = await asyncio.start_server(lambda r, w: serve_connection(gateway, r, w), host, port,
+                                        limit=MAX_HEADER_BYTES, backlog=1024)
+    return server, gateway
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default=os.getenv("GATEWAY_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("GATEWAY_PORT", "8081")))
+    parser.add_argument("--nominatim", default=NOMINATIM_URL)
+    parser.add_argument("--open-meteo", default=OPEN_METEO_URL)
+    parser.add_argument("--pool-size", type=int, default=8, help="Keep-alive verbindingen per upstream-host")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Timeout per upstream-call (s)")
+    parser.add_argument("--grid", type=float, default=FORECAST_GRID_DEG, help="Gridcel van de forecast-cache (graden)")
+    parser.add_argument("--cache-bytes", type=int, default=FORECAST_CACHE_BYTES, help="Maximum geheugenlaag (bytes)")
+    parser.add_argument("--cache-dir", default=FORECAST_CACHE_DIR, help="Disklaag; leeg = uit")
+    parser.add_argument("--disk-bytes", type=int, default=FORECAST_DISK_BYTES, help="Maximum disklaag (bytes)")
+    parser.add_argument("--no-cache", action="store_true", help="Elke forecast direct bij Open-Meteo ophalen")
+    parser.add_argument("--no-coalesce", action="store_true", help="Geen single-flight voor identieke lookups")
+    args = parser.parse_args()
+
+    fast = install_fast_loop()
+
+    async def main():
+        pool = AsyncHttpPool(max_per_host=args.pool_size, timeout=args.timeout, user_agent=USER_AGENT)
+        cache = None if args.no_cache else ForecastCache(args.grid, args.cache_bytes, args.cache_dir or None, args.disk_bytes)
+        gateway = WeatherGateway(pool, args.nominatim, args.open_meteo, cache, coalesce=not args.no_coalesce)
+        server, _ = await serve(args.host, args.port, gateway)
+        print(f"🌦️ Weather-gateway op http://{args.host}:{args.port} "
+              f"(upstream: {args.nominatim}, {args.open_meteo}; {'uvloop' if fast else 'asyncio'})")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            pool.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
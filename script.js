@@ -7,10 +7,14 @@ const searchInput = document.querySelector("#search");
 
 // Global variables
 let currentLat, currentLon;
+// Optional: weather-gateway (gateway/weather_gateway.py) that does geocode + forecast
+// in one request. Empty = call Nominatim and Open-Meteo directly from the browser.
+const GATEWAY_URL = window.WEATHER_GATEWAY_URL || "";
 
 // Load weather for a city
 async function getGeoData(search) {
   if (!search) return;
+  if (GATEWAY_URL) return getGatewayData(search);
 
   const url = `https://nominatim.openstreetmap.org/search?q=${encodeURIComponent(
     search,
@@ -87,6 +91,26 @@ async function getGeoData(search) {
   }
 }
 
+// One round trip: the gateway resolves the city and returns its forecast
+async function getGatewayData(search) {
+  const url = `${GATEWAY_URL}/weather?city=${encodeURIComponent(search)}&units=${ddlUnits.value}`;
+
+  try {
+    const response = await fetch(url);
+    if (!response.ok) throw new Error(`Response status: ${response.status}`);
+
+    const result = await response.json();
+    currentLat = result.coord.lat;
+    currentLon = result.coord.lon;
+
+    loadLocationData([result.location], result.location);
+    getWeatherData(currentLat, currentLon, result);
+  } catch (error) {
+    console.error(error.message);
+    alert("City not found. Please try again.");
+  }
+}
+
 // Update city, country, date
 function loadLocationData(locationData, selectedResult = null) {
   // Als we een specifiek geselecteerd resultaat hebben, gebruik die.
@@ -132,7 +156,7 @@ function loadLocationData(locationData, selectedResult = null) {
 }
 
 // Load weather data
-async function getWeatherData(lat, lon) {
+async function getWeatherData(lat, lon, prefetched = null) {
   // 1️⃣ Units
   let tempUnit = "celsius";
   let windUnit = "kmh";
@@ -146,14 +170,18 @@ async function getWeatherData(lat, lon) {
     unitSymbol = "°F";
   }
 
-  // 2️⃣ Build API URL
-  const url = `https://api.open-meteo.com/v1/forecast?latitude=${lat}&longitude=${lon}&current_weather=true&hourly=temperature_2m,apparent_temperature,relative_humidity_2m,precipitation,wind_speed_10m,weather_code&daily=temperature_2m_max,temperature_2m_min,weather_code&temperature_unit=${tempUnit}&wind_speed_unit=${windUnit}&precipitation_unit=${precipUnit}&timezone=auto`;
+  // 2️⃣ Build API URL (via the gateway when configured)
+  const url = GATEWAY_URL
+    ? `${GATEWAY_URL}/weather?lat=${lat}&lon=${lon}&units=${ddlUnits.value}`
+    : `https://api.open-meteo.com/v1/forecast?latitude=${lat}&longitude=${lon}&current_weather=true&hourly=temperature_2m,apparent_temperature,relative_humidity_2m,precipitation,wind_speed_10m,weather_code&daily=temperature_2m_max,temperature_2m_min,weather_code&temperature_unit=${tempUnit}&wind_speed_unit=${windUnit}&precipitation_unit=${precipUnit}&timezone=auto`;
 
   try {
-    const response = await fetch(url);
-    if (!response.ok) throw new Error(`Response status: ${response.status}`);
-
-    const result = await response.json();
+    let result = prefetched;
+    if (!result) {
+      const response = await fetch(url);
+      if (!response.ok) throw new Error(`Response status: ${response.status}`);
+      result = await response.json();
+    }
     console.log("Weather API result:", result);
 
     if (!result.daily || !result.hourly) {
@@ -0,0 +1,75 @@
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+from bench_weather_stub import free_port, wait_for_port
+
+# Load-test voor single-flight in de weather-gateway.
+# Start de weather-stub als trage upstream (--delay-ms) en de gateway zonder cache,
+# en vuurt per stap N gelijktijdige requests voor dezelfde stad af. Met coalescing
+# blijft het aantal upstream-calls per stap gelijk (1 geocode + 1 forecast),
+# zonder groeit het lineair mee met N.
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+GATEWAY = os.path.join(os.path.dirname(TESTS_DIR), "gateway", "weather_gateway.py")
+
+async def fetch(port, path):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n\r\n".encode())
+    data = await reader.read()
+    writer.close()
+    head, _, body = data.partition(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1]), body
+
+async def upstream_calls(port):
+    _, body = await fetch(port, "/stats")
+    return json.loads(body)["upstream"]["requests"]
+
+async def burst(port, concurrency, city):
+    before = await upstream_calls(port)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(fetch(port, f"/weather?city={city}") for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    ok = sum(1 for status, _ in results if status == 200)
+    return ok, await upstream_calls(port) - before, elapsed
+
+def run_mode(levels, delay_ms, coalesce):
+    stub_port, gateway_port = free_port(), free_port()
+    stub = subprocess.Popen([sys.executable, os.path.join(TESTS_DIR, "weather_stub.py"), "--port", str(stub_port),
+                             "--delay-ms", str(delay_ms)], stdout=subprocess.DEVNULL)
+    upstream = f"http://127.0.0.1:{stub_port}"
+    cmd = [sys.executable, GATEWAY, "--host", "127.0.0.1", "--port", str(gateway_port), "--nominatim", upstream,
+           "--open-meteo", upstream, "--no-cache", "--pool-size", "512"]
+    gateway = subprocess.Popen(cmd + ([] if coalesce else ["--no-coalesce"]), stdout=subprocess.DEVNULL)
+    rows = []
+    try:
+        wait_for_port(stub_port)
+        wait_for_port(gateway_port)
+        for concurrency in levels:
+            ok, calls, elapsed = asyncio.run(burst(gateway_port, concurrency, "Oslo"))
+            rows.append({"concurrency": concurrency, "ok": ok, "upstream_calls": calls,
+                         "seconds": round(elapsed, 3)})
+    finally:
+        for proc in (gateway, stub):
+            proc.terminate()
+            proc.wait()
+    return rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--levels", default="1,10,50,100,250", help="Gelijktijdige requests per stap")
+    parser.add_argument("--delay-ms", type=float, default=100.0, help="Gesimuleerde upstream-latency")
+    parser.add_argument("--compare", action="store_true", help="Draai ook zonder coalescing")
+    args = parser.parse_args()
+    levels = [int(n) for n in args.levels.split(",")]
+
+    modes = [("coalescing", True)] + ([("zonder", False)] if args.compare else [])
+    for label, coalesce in modes:
+        print(f"\n🔀 Gateway {label} (upstream {args.delay_ms:g} ms)")
+        print(f"{'gelijktijdig':>12} {'ok':>6} {'upstream':>9} {'tijd':>8}")
+        for row in run_mode(levels, args.delay_ms, coalesce):
+            print(f"{row['concurrency']:>12} {row['ok']:>6} {row['upstream_calls']:>9} {row['seconds']:>7.2f}s")
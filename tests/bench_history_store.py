@@ -0,0 +1,87 @@
+import argparse
+import csv
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import history_store
+
+STATUSES = ["PASS", "PASS", "PASS", "FAIL", "OVERRIDDEN"]
+
+def synthetic_runs(count, versions, start=1_700_000_000.0):
+    rng = random.Random(42)
+    for i in range(count):
+        version = f"2.1.{i % versions}"
+        yield (start + i * 60, version, round(rng.uniform(60, 100), 1), round(rng.uniform(50, 100), 1),
+               rng.choice(STATUSES), "", "bench")
+
+def csv_latest(csv_path, version):
+    # Het oude alternatief: de hele CSV doorlopen
+    latest = None
+    with open(csv_path, newline="") as f:
+        for fields in csv.reader(f):
+            if fields and fields[0] == version:
+                latest = fields
+    return latest
+
+def timed_ms(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def run(count, versions, rounds):
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = os.path.join(workdir, "history.db")
+        csv_path = os.path.join(workdir, "history.csv")
+        conn = history_store.connect(db_path)
+
+        start = time.perf_counter()
+        with conn:
+            conn.executemany(
+                "INSERT INTO runs (recorded_at, version, cqi, rqi, status, override_reason, source) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                synthetic_runs(count, versions),
+            )
+        insert_s = time.perf_counter() - start
+
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            for row in synthetic_runs(count, versions):
+                writer.writerow([row[1], row[2], row[3], row[4], row[5]])
+
+        probe = [f"2.1.{rng.randrange(versions)}" for _ in range(rounds)]
+        it = iter(probe * 2)
+        latest_ms = timed_ms(lambda: history_store.latest_for_version(conn, next(it)), rounds)
+
+        last = 1_700_000_000.0 + (count - 1) * 60
+        day_ms = timed_ms(lambda: sum(1 for _ in history_store.runs_between(conn, last - 86_400, last + 1)), rounds)
+        week_ms = timed_ms(lambda: sum(1 for _ in history_store.runs_between(conn, last - 7 * 86_400, last + 1)), rounds)
+        csv_ms = timed_ms(lambda: csv_latest(csv_path, probe[0]), 3)
+
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM runs WHERE version = ? ORDER BY recorded_at DESC, id DESC LIMIT 1",
+            ("2.1.0",),
+        ).fetchall()
+        conn.close()
+
+    print(f"runs: {count:,}  versies: {versions:,}")
+    print(f"bulk insert                : {insert_s:>9.2f} s")
+    print(f"latest_for_version (p50)   : {latest_ms:>9.3f} ms")
+    print(f"range scan 1 dag (p50)     : {day_ms:>9.3f} ms")
+    print(f"range scan 7 dagen (p50)   : {week_ms:>9.3f} ms")
+    print(f"CSV full scan latest (p50) : {csv_ms:>9.1f} ms")
+    print("query plan                 : " + " | ".join(r[-1] for r in plan))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=1_000_000)
+    parser.add_argument("--versions", type=int, default=5_000)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    run(args.runs, args.versions, args.rounds)
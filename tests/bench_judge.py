@@ -0,0 +1,165 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+
+# Benchmark-suite voor de Judge (calculate_score.py).
+# Genereert synthetische Trivy-, k6 summary-, entry- en accuracy-artifacts in
+# meerdere groottes en meet de fases collection, parse, scoring en history-write
+# apart. Sonar draait tegen de lokale stand-in, dus alles werkt offline.
+# Resultaten worden als JSON Lines weggeschreven (één regel per run) zodat de
+# Judge-overhead per versie gevolgd kan worden.
+
+SIZES = {
+    "small": {"vulns": 100, "scenarios": 10, "submetrics": 5},
+    "medium": {"vulns": 10_000, "scenarios": 1_000, "submetrics": 50},
+    "large": {"vulns": 200_000, "scenarios": 20_000, "submetrics": 500},
+}
+
+def write_k6_summary(path, submetrics, seed):
+    # Vorm van k6 --summary-export, met getagde submetrics zoals bij veel endpoints
+    metrics = {
+        "http_req_duration": {"avg": 80 + seed, "min": 5, "med": 70, "max": 900,
+                              "p(90)": 140, "p(95)": 180 + seed, "p(99)": 350},
+        "http_req_failed": {"passes": 3, "fails": 2997, "value": 0.001},
+        "checks": {"passes": 5990, "fails": 10, "value": 0.998},
+        "iterations": {"count": 3000, "rate": 50.0},
+    }
+    for i in range(submetrics):
+        metrics[f"http_req_duration{{name:/endpoint/{i}}}"] = {
+            "avg": 80, "min": 5, "med": 70, "max": 900, "p(90)": 140, "p(95)": 180, "p(99)": 350,
+        }
+    with open(path, "w") as f:
+        json.dump({"root_group": {"name": "", "path": "", "groups": [], "checks": []}, "metrics": metrics}, f)
+
+def write_artifacts(root, spec):
+    from bench_trivy_stream import write_synthetic_report
+
+    write_synthetic_report(os.path.join(root, "security_results.json"), spec["vulns"])
+    for seed, prefix in enumerate(("perf", "load", "chaos")):
+        write_k6_summary(os.path.join(root, f"{prefix}_results.json"), spec["submetrics"], seed)
+    with open(os.path.join(root, "entry_results.json"), "w") as f:
+        json.dump({"score": 100, "detail": "App up on port 57974"}, f)
+    with open(os.path.join(root, "accuracy_results.json"), "w") as f:
+        json.dump({
+            "test_name": "Location Accuracy & Mapping",
+            "scenarios": [{"input": f"City {i}", "expected": "GR", "received": "GR", "status": "PASS"}
+                          for i in range(spec["scenarios"])],
+            "score": 100,
+        }, f)
+    return sum(os.path.getsize(os.path.join(root, n)) for n in os.listdir(root))
+
+def timed_ms(fn):
+    start = time.perf_counter()
+    value = fn()
+    return (time.perf_counter() - start) * 1000, value
+
+def bench_size(name, spec, rounds, workdir):
+    import calculate_score as judge
+    import history_store
+
+    root = os.path.join(workdir, name)
+    os.makedirs(root)
+    artifact_bytes = write_artifacts(root, spec)
+
+    history_db = os.path.join(workdir, f"{name}_history.db")
+    conn = history_store.connect(history_db)
+    with conn:
+        conn.executemany(
+            "INSERT INTO runs (recorded_at, version, cqi, rqi, status) VALUES (?, ?, ?, ?, ?)",
+            [(1_700_000_000 + i * 60, f"2.1.{i}", 90.0 + i % 5, 85.0 + i % 7, "PASS") for i in range(1_000)],
+        )
+    conn.close()
+
+    phases = {"collection": [], "parse": [], "scoring": [], "history_write": [], "end_to_end": []}
+    per_pillar = {}
+    for _ in range(rounds):
+        # Collection: Sonar-lookup (stand-in, geen cache) + artifacts lokaliseren
+        def collect():
+            status, _ = judge.get_sonar_status(timeout=5)
+            paths = {prefix: os.path.join(root, f"{prefix}_results.json") for _, prefix in judge.PILLARS}
+            return status, {p: path for p, path in paths.items() if os.path.exists(path)}
+        ms, (status, paths) = timed_ms(collect)
+        phases["collection"].append(ms)
+
+        # Parse: elk artifact naar een pilaarresultaat
+        results = {"Code Quality": {"score": 100 if status == "OK" else 0, "detail": status, "skipped": False}}
+        parse_total = 0.0
+        for pillar, prefix in judge.PILLARS:
+            if prefix not in paths:
+                continue
+            ms, results[pillar] = timed_ms(lambda: judge.parse_pillar_file(prefix, paths[prefix]))
+            per_pillar.setdefault(prefix, []).append(ms)
+            parse_total += ms
+        phases["parse"].append(parse_total)
+
+        # Scoring: CQI/RQI + trendanalyse over de historie
+        def score():
+            cqi, rqi = judge.compute_indexes(results)
+            judge.analyse_trend(cqi, rqi, history_db)
+            return cqi, rqi
+        ms, (cqi, rqi) = timed_ms(score)
+        phases["scoring"].append(ms)
+
+        # History-write: zoals stap 7 van calculate()
+        def write_history():
+            conn = history_store.connect(history_db)
+            history_store.record_run(conn, "bench", cqi, rqi, "PASS")
+            conn.close()
+        ms, _ = timed_ms(write_history)
+        phases["history_write"].append(ms)
+
+        ms, _ = timed_ms(lambda: judge.collect_concurrent(root, deadline=30))
+        phases["end_to_end"].append(ms)
+
+    return {
+        "size": name,
+        "spec": spec,
+        "artifact_bytes": artifact_bytes,
+        "phases_ms": {phase: round(statistics.median(v), 3) for phase, v in phases.items()},
+        "parse_ms_per_pillar": {p: round(statistics.median(v), 3) for p, v in per_pillar.items()},
+    }
+
+def run(sizes, rounds, output):
+    from sonar_stub import start_stub
+
+    server, base_url = start_stub(status="OK")
+    with tempfile.TemporaryDirectory() as workdir:
+        # Sonar altijd via de stand-in en zonder cache, zodat de lookup echt gemeten wordt
+        os.environ["SONAR_HOST_URL"] = base_url
+        os.environ["SONAR_CACHE_TTL"] = "0"
+        os.environ["SONAR_CACHE_DIR"] = os.path.join(workdir, "sonar")
+        rows = [bench_size(name, SIZES[name], rounds, workdir) for name in sizes]
+    server.shutdown()
+
+    record = {
+        "version": os.getenv("APP_VERSION", "0.0.0-unknown"),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "rounds": rounds,
+        "results": rows,
+    }
+    if output:
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        with open(output, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    header = f"{'size':<8} {'MB':>7} | " + " ".join(f"{p:>13}" for p in rows[0]["phases_ms"])
+    print(header)
+    for r in rows:
+        cells = " ".join(f"{v:>13.2f}" for v in r["phases_ms"].values())
+        print(f"{r['size']:<8} {r['artifact_bytes'] / 1e6:>7.1f} | {cells}")
+    print("(mediaan in ms)")
+    return record
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), choices=list(SIZES))
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", default="judge_bench.jsonl", help="JSON Lines bestand (append)")
+    args = parser.parse_args()
+    run(args.sizes, args.rounds, args.output)
@@ -0,0 +1,64 @@
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import requests
+
+from sonar_cache import fetch_status
+from sonar_stub import start_stub
+
+PROJECT_KEY = "MKwaak_weather-app-main"
+# Cache-sleutel zoals in CI (commit-SHA); zonder sleutel wordt "latest" nooit op TTL gecachet
+REVISION = "0" * 40
+
+def timed(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def run(rounds, delay):
+    server, base_url = start_stub(status="OK", delay=delay)
+    session = requests.Session()
+    rows = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # 1. Zonder cache: elke lookup gaat over HTTP
+        rows["network (ttl=0, cold)"] = timed(
+            lambda: fetch_status(PROJECT_KEY, revision=REVISION, host_url=base_url, ttl=0,
+                                 cache_dir=os.path.join(cache_dir, "cold", str(time.perf_counter_ns())),
+                                 session=session),
+            rounds)
+
+        # 2. Verlopen entry: conditionele revalidatie met If-None-Match -> 304
+        fetch_status(PROJECT_KEY, revision=REVISION, host_url=base_url, ttl=0, cache_dir=cache_dir, session=session)
+        rows["revalidate (304)"] = timed(
+            lambda: fetch_status(PROJECT_KEY, revision=REVISION, host_url=base_url, ttl=0, cache_dir=cache_dir, session=session),
+            rounds)
+
+        # 3. Verse entry binnen de TTL: alleen disk
+        rows["cache hit"] = timed(
+            lambda: fetch_status(PROJECT_KEY, revision=REVISION, host_url=base_url, ttl=3600, cache_dir=cache_dir, session=session),
+            rounds)
+
+        # 4. Stand-in weg: laatst bekende status wordt gebruikt
+        server.shutdown()
+        server.server_close()
+        status, source = fetch_status(PROJECT_KEY, revision=REVISION, host_url=base_url, ttl=0, cache_dir=cache_dir, timeout=1)
+        assert (status, source) == ("OK", "stale"), (status, source)
+
+    print(f"{'path':<24} {'p50 ms':>8} {'max ms':>8}")
+    for name, samples in rows.items():
+        print(f"{name:<24} {statistics.median(samples):>8.2f} {max(samples):>8.2f}")
+    print(f"offline fallback         : {status} ({source})")
+    print(f"stub hits: {server.hits}, waarvan 304: {server.not_modified}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.0, help="Gesimuleerde Sonar-latency in seconden")
+    args = parser.parse_args()
+    run(args.rounds, args.delay)
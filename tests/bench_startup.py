@@ -0,0 +1,60 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Cold-start benchmark voor de Judge en de test-scripts, op basis van -X importtime.
+# Faalt (exit 1) als de import-tijd boven het budget komt of als zware modules
+# (requests, numpy, ...) al bij het importeren geladen worden.
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS = ["calculate_score", "location_test"]
+HEAVY_MODULES = ["requests", "urllib3", "charset_normalizer", "ssl", "numpy"]
+
+def measure(module):
+    # Eén koude interpreter: cumulatieve import-tijd van het script + geladen modules
+    code = f"import sys, {module}; print(','.join(sorted(sys.modules)))"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=TESTS_DIR, capture_output=True, text=True, check=True,
+    )
+    cumulative_us = None
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, self_us, cum_us, name = (part.strip() for part in line.replace("import time:", "|", 1).split("|"))
+        if name == module:
+            cumulative_us = int(cum_us)
+    return cumulative_us / 1000, set(proc.stdout.strip().split(","))
+
+def run(scripts, rounds, budget_ms):
+    failures = []
+    print(f"{'script':<18} {'p50 ms':>8} {'max ms':>8} {'budget':>8}  zware modules")
+    for module in scripts:
+        samples, loaded = [], set()
+        for _ in range(rounds):
+            ms, modules = measure(module)
+            samples.append(ms)
+            loaded |= modules
+        heavy = [m for m in HEAVY_MODULES if m in loaded]
+        p50 = statistics.median(samples)
+        print(f"{module:<18} {p50:>8.2f} {max(samples):>8.2f} {budget_ms:>8.1f}  {', '.join(heavy) or '-'}")
+        if p50 > budget_ms:
+            failures.append(f"{module}: import {p50:.1f} ms > budget {budget_ms:.1f} ms")
+        if heavy:
+            failures.append(f"{module}: laadt {', '.join(heavy)} al bij import")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ Startup binnen budget")
+    return not failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scripts", nargs="+", default=SCRIPTS)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("STARTUP_BUDGET_MS", "50")))
+    args = parser.parse_args()
+    sys.exit(0 if run(args.scripts, args.rounds, args.budget_ms) else 1)
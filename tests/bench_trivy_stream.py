@@ -0,0 +1,104 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from trivy_stream import count_vulnerabilities
+
+SEVERITIES = ["CRITICAL", "HIGH", "MEDIUM", "LOW"]
+
+def write_synthetic_report(path, vuln_count, targets=8):
+    # Schrijft een Trivy-achtig rapport regel voor regel weg (zonder het in het geheugen op te bouwen)
+    per_target = max(1, vuln_count // targets)
+    written = 0
+    with open(path, "w") as f:
+        # Metadata met floats, zoals echte Trivy-rapporten; die sectie wordt overgeslagen
+        f.write('{"SchemaVersion": 2, "ArtifactName": "mkwaak/weather-app-main:bench", '
+                '"Metadata": {"ImageConfig": {"created": "2026-01-17T22:45:00Z", "size": 1.2345e7, '
+                '"ratio": 0.618033988749895, "layers": [12.5, -3.25E-2, 100.0]}}, "Results": [')
+        t = 0
+        while written < vuln_count:
+            if t:
+                f.write(",")
+            f.write(json.dumps({"Target": f"layer-{t}", "Class": "os-pkgs", "Type": "alpine"})[:-1])
+            f.write(', "Vulnerabilities": [')
+            n = min(per_target, vuln_count - written)
+            for i in range(n):
+                if i:
+                    f.write(",")
+                f.write(json.dumps({
+                    "VulnerabilityID": f"CVE-2026-{written + i:07d}",
+                    "PkgName": f"pkg-{(written + i) % 997}",
+                    "InstalledVersion": "1.2.3-r0",
+                    "FixedVersion": "1.2.4-r0",
+                    "Severity": SEVERITIES[(written + i) % len(SEVERITIES)],
+                    "Title": "Synthetic vulnerability for benchmarking",
+                    "References": ["https://example.invalid/advisory"],
+                    "CVSS": {"nvd": {"V3Score": round(1.0 + (written + i) % 90 / 10.0, 1), "V2Score": 4.35e0}},
+                }))
+            f.write("]}")
+            written += n
+            t += 1
+        f.write("]}")
+
+def count_with_json_load(path):
+    # Het oorspronkelijke pad uit calculate_score.py
+    with open(path, "r") as f:
+        data = json.load(f)
+    vulns = 0
+    for r in data.get("Results", []):
+        vulns += len(r.get("Vulnerabilities", []))
+    return vulns
+
+def measure(fn, path):
+    start = time.perf_counter()
+    result = fn(path)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def run(sizes, workdir):
+    rows = []
+    for size in sizes:
+        path = os.path.join(workdir, f"trivy_{size}.json")
+        write_synthetic_report(path, size)
+        mb = os.path.getsize(path) / 1e6
+
+        loaded, load_s, load_peak = measure(count_with_json_load, path)
+        streamed, stream_s, stream_peak = measure(count_vulnerabilities, path)
+        assert loaded == streamed["total"] == size, (loaded, streamed["total"], size)
+
+        rows.append({
+            "vulnerabilities": size,
+            "file_mb": round(mb, 1),
+            "json_load_s": round(load_s, 3),
+            "json_load_peak_mb": round(load_peak / 1e6, 1),
+            "stream_s": round(stream_s, 3),
+            "stream_peak_mb": round(stream_peak / 1e6, 1),
+        })
+        os.remove(path)
+    return rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--output", help="Schrijf de resultaten ook als JSON weg")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        rows = run(args.sizes, workdir)
+
+    print(f"{'vulns':>10} {'MB':>8} | {'json.load s':>11} {'peak MB':>8} | {'stream s':>9} {'peak MB':>8}")
+    for r in rows:
+        print(f"{r['vulnerabilities']:>10} {r['file_mb']:>8} | {r['json_load_s']:>11} {r['json_load_peak_mb']:>8} | "
+              f"{r['stream_s']:>9} {r['stream_peak_mb']:>8}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2)
@@ -0,0 +1,107 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+
+# Throughput-benchmark voor tests/weather_stub.py.
+# Start de stub als apart proces (één core) en belast hem met keep-alive
+# verbindingen uit meerdere client-processen.
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PATHS = ["/health", "/weather?city=Athens", "/weather?city=Oslo", "/weather?city=London"]
+
+class ClientProtocol(asyncio.Protocol):
+    def __init__(self, request, depth, stop_at, done):
+        self.request = request
+        self.depth = depth
+        self.stop_at = stop_at
+        self.done = done
+        self.buffer = b""
+        self.completed = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+        transport.write(self.request * self.depth)
+
+    def data_received(self, data):
+        self.buffer += data
+        finished = 0
+        while True:
+            end = self.buffer.find(b"\r\n\r\n")
+            if end < 0:
+                break
+            head = self.buffer[:end].lower()
+            start = head.find(b"content-length:")
+            length = int(head[start + 15:head.find(b"\r\n", start) if head.find(b"\r\n", start) > 0 else None]) if start >= 0 else 0
+            if len(self.buffer) < end + 4 + length:
+                break
+            self.buffer = self.buffer[end + 4 + length:]
+            finished += 1
+        self.completed += finished
+        if time.perf_counter() >= self.stop_at:
+            self.transport.close()
+        elif finished:
+            self.transport.write(self.request * finished)
+
+    def connection_lost(self, exc):
+        if not self.done.done():
+            self.done.set_result(self.completed)
+
+async def drive(port, connections, depth, seconds, path):
+    loop = asyncio.get_running_loop()
+    request = f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n".encode()
+    stop_at = time.perf_counter() + seconds
+    waiters = []
+    for _ in range(connections):
+        done = loop.create_future()
+        await loop.create_connection(lambda: ClientProtocol(request, depth, stop_at, done), "127.0.0.1", port)
+        waiters.append(done)
+    return sum(await asyncio.gather(*waiters))
+
+def client_process(args):
+    port, connections, depth, seconds, path = args
+    return asyncio.run(drive(port, connections, depth, seconds, path))
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def wait_for_port(port, timeout=10.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"stub niet bereikbaar op poort {port}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=2, help="Aantal client-processen")
+    parser.add_argument("--connections", type=int, default=32, help="Verbindingen per client")
+    parser.add_argument("--depth", type=int, default=1, help="Gepipelinede requests per verbinding")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    port = free_port()
+    stub = subprocess.Popen([sys.executable, os.path.join(TESTS_DIR, "weather_stub.py"), "--port", str(port)],
+                            stdout=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        jobs = [(port, args.connections, args.depth, args.seconds, PATHS[i % len(PATHS)]) for i in range(args.clients)]
+        start = time.perf_counter()
+        with multiprocessing.Pool(args.clients) as pool:
+            total = sum(pool.map(client_process, jobs))
+        elapsed = time.perf_counter() - start
+    finally:
+        stub.terminate()
+        stub.wait()
+
+    print(f"{total:,} responses in {elapsed:.1f}s -> {total / elapsed:,.0f} req/s "
+          f"({args.clients} clients x {args.connections} verbindingen, pipelining {args.depth})")
@@ -0,0 +1,70 @@
+import fcntl
+import json
+import os
+
+# Page-load metingen uit de browser zelf (Navigation Timing, Paint Timing, LCP en
+# Resource Timing). Cross-origin resources zonder Timing-Allow-Origin melden
+# transferSize 0; die tellen dus niet mee in transferred_bytes.
+
+COLLECT_JS = """
+() => new Promise(resolve => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+    const resources = performance.getEntriesByType('resource');
+    let lcp = null;
+    try {
+        new PerformanceObserver(list => {
+            const entries = list.getEntries();
+            if (entries.length) lcp = entries[entries.length - 1].startTime;
+        }).observe({type: 'largest-contentful-paint', buffered: true});
+    } catch (e) {}
+    // Gebufferde LCP-entries komen in een volgende task binnen
+    setTimeout(() => resolve({
+        navigation: nav ? {
+            dns_ms: nav.domainLookupEnd - nav.domainLookupStart,
+            connect_ms: nav.connectEnd - nav.connectStart,
+            ttfb_ms: nav.responseStart - nav.requestStart,
+            response_ms: nav.responseEnd - nav.responseStart,
+            dom_interactive_ms: nav.domInteractive,
+            dom_content_loaded_ms: nav.domContentLoadedEventEnd,
+            load_ms: nav.loadEventEnd,
+        } : null,
+        fcp_ms: fcp ? fcp.startTime : null,
+        lcp_ms: lcp,
+        transferred_bytes: (nav ? nav.transferSize : 0) + resources.reduce((sum, r) => sum + (r.transferSize || 0), 0),
+        resources: resources.length,
+    }), 100);
+})
+"""
+
+def collect_page_metrics(page):
+    metrics = page.evaluate(COLLECT_JS)
+    rounded = lambda v: round(v, 1) if isinstance(v, (int, float)) else v
+    if metrics.get("navigation"):
+        metrics["navigation"] = {k: rounded(v) for k, v in metrics["navigation"].items()}
+    metrics["fcp_ms"] = rounded(metrics.get("fcp_ms"))
+    metrics["lcp_ms"] = rounded(metrics.get("lcp_ms"))
+    return metrics
+
+def write_entry_results(path, detail=None, **sections):
+    # Vult het bestaande entry-resultaat (score/detail van de health-check) aan;
+    # zonder eerder resultaat telt een geslaagde browsercheck als 100.
+    # Een meegegeven detail vervangt altijd dat van de health-check.
+    # Shards schrijven tegelijk naar hetzelfde bestand: read-modify-write onder een lock
+    with open(f"{path}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        results = {"score": 100}
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    results = json.load(f)
+            except ValueError:
+                pass
+        if detail is not None:
+            results["detail"] = detail
+        results.update(sections)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(results, f, indent=2)
+        os.replace(tmp, path)
+    return results
@@ -1,83 +1,229 @@
 import os
 import json
-import requests
-import sys
+import threading
+import time
+import history_store
+from k6_summary import K6_PREFIXES, budgets_for, ratio_score, score_summary
+from pillar_cache import DEFAULT_CACHE_FILE, PillarCache, file_digest
+from sonar_cache import DEFAULT_CACHE_DIR, DEFAULT_HOST, DEFAULT_REPORT_TASK, DEFAULT_TTL, fetch_status, resolve_revision
+from trivy_stream import count_vulnerabilities
 
-def get_sonar_status():
+# De 7 Pilaren van Kwaliteit
+PILLARS = [
+    ("Entry Check", "entry"),
+    ("Code Quality", "sonar"),
+    ("Functionality", "accuracy"),
+    ("Security Scan", "security"),
+    ("Performance", "perf"),
+    ("Load Stability", "load"),
+    ("Chaos Resilience", "chaos")
+]
+
+CQI_NAMES = ["Entry Check", "Code Quality", "Functionality", "Security Scan"]
+
+# Minimale RQI voor de Quality Gate
+THRESHOLD = 80.0
+
+def get_sonar_status(timeout=10):
     token = os.getenv("SONAR_TOKEN")
     project_key = "MKwaak_weather-app-main"
-    url = f"https://sonarcloud.io/api/qualitygates/project_status?projectKey={project_key}"
+    # Lookup via de disk-cache; SONAR_HOST_URL kan naar de lokale stand-in (tests/sonar_stub.py) wijzen
+    # Geeft (status, bron) terug; de cache is per analyse (ceTaskId / GITHUB_SHA) gesleuteld
+    return fetch_status(
+        project_key,
+        analysis_id=os.getenv("SONAR_ANALYSIS_ID") or None,
+        revision=resolve_revision(os.getenv("SONAR_REPORT_TASK", DEFAULT_REPORT_TASK)),
+        host_url=os.getenv("SONAR_HOST_URL", DEFAULT_HOST),
+        token=token,
+        ttl=float(os.getenv("SONAR_CACHE_TTL", DEFAULT_TTL)),
+        cache_dir=os.getenv("SONAR_CACHE_DIR", DEFAULT_CACHE_DIR),
+        timeout=timeout,
+    )
+
+def collect_pillar(name, prefix, base_dir="tests", sonar_timeout=10, cache=None):
+    if name == "Code Quality":
+        status, source = get_sonar_status(timeout=sonar_timeout)
+        detail = f"Sonar: {status}"
+        if source != "network":
+            detail += f" ({source})"
+        # Een verouderde status (Sonar onbereikbaar) telt niet mee in de gate
+        return {
+            "score": 100 if status == "OK" else 0, 
+            "detail": detail, 
+            "skipped": status == "UNKNOWN" or source == "stale"
+        }
+
+    file_path = os.path.join(base_dir, f"{prefix}_results.json")
+    if not os.path.exists(file_path):
+        return {"score": 0, "detail": "Skipped", "skipped": True}
+
+    if cache is None:
+        return parse_pillar_file(prefix, file_path)
+
+    # Incrementeel: ongewijzigd artifact + ongewijzigde config => resultaat hergebruiken
+    digest = file_digest(file_path)
+    fingerprint = pillar_fingerprint(prefix)
+    result = cache.get(file_path, digest, fingerprint)
+    if result is None:
+        result = parse_pillar_file(prefix, file_path)
+        cache.put(file_path, digest, fingerprint, result)
+    return result
+
+def accuracy_p95_budget():
+    return float(os.getenv("ACCURACY_P95_BUDGET_MS", "800"))
+
+def pillar_fingerprint(prefix):
+    # Scoringsconfig hoort bij de cache-sleutel: andere budgetten => opnieuw scoren
+    if prefix in K6_PREFIXES:
+        config = budgets_for(prefix)
+    elif prefix == 'accuracy':
+        config = {"p95_ms": accuracy_p95_budget()}
+    else:
+        config = {}
+    return f"{prefix}:" + json.dumps(config, sort_keys=True)
+
+def parse_pillar_file(prefix, file_path):
+    if prefix == 'security':
+        # Trivy JSON streamend parsen: grote rapporten nooit volledig in het geheugen
+        try:
+            summary = count_vulnerabilities(file_path)
+        except:
+            return {"score": 0, "detail": "Format error", "skipped": True}
+        vulns = summary["total"]
+        score = max(0, 100 - (vulns * 10))
+        detail = f"{vulns} issues"
+        if summary["by_severity"]:
+            per_severity = ", ".join(f"{sev[0]}:{n}" for sev, n in sorted(summary["by_severity"].items()))
+            detail += f" ({per_severity})"
+        return {"score": score, "detail": detail, "skipped": False}
+
     try:
-        response = requests.get(url, auth=(token, "") if token else None, timeout=10)
-        data = response.json()
-        return "OK" if data['projectStatus']['status'] == "OK" else "ERROR"
-    except Exception as e:
-        return "UNKNOWN"
+        with open(file_path, 'r') as f:
+            data = json.load(f)
+            score = data.get('score', 0)
+            
+            # Detail extractie per type test
+            if prefix == 'entry':
+                detail = data.get('detail', 'Up')
+                browser = data.get('browser') or {}
+                if browser.get('lcp_ms') is not None:
+                    detail += f", LCP {browser['lcp_ms']:.0f}ms, {browser.get('transferred_bytes', 0) / 1024:.0f}KB"
+            elif prefix == 'accuracy':
+                detail = f"Acc: {score}%"
+                geo_p95 = data.get('coordinates', {}).get('p95_km')
+                if geo_p95 is not None:
+                    detail += f", geo p95 {geo_p95:.1f}km"
+                if data.get('flagged'):
+                    detail += f", {len(data['flagged'])}/{len(data.get('targets', []))} replica's afwijkend"
+                # Latency telt mee: accuraat maar veel trager mag niet ongemerkt door de gate
+                p95 = data.get('latency', {}).get('total_ms', {}).get('p95')
+                if p95 is not None:
+                    latency_score = ratio_score(p95, accuracy_p95_budget())
+                    score = int(round(0.7 * score + 0.3 * latency_score))
+                    detail += f", p95 {p95:.0f}ms"
+            elif prefix in K6_PREFIXES:
+                # k6 --summary-export: score op gemeten latency, fouten en checks
+                scored = score_summary(data, budgets_for(prefix))
+                score, detail = scored if scored else (score, f"Score: {score}%")
+            else:
+                detail = f"Score: {score}%"
+            
+            return {"score": score, "detail": detail, "skipped": False}
+    except:
+        return {"score": 0, "detail": "Format error", "skipped": True}
+
+def collect_sequential(base_dir="tests", cache=None):
+    return {name: collect_pillar(name, prefix, base_dir, cache=cache) for name, prefix in PILLARS}
+
+def collect_concurrent(base_dir="tests", deadline=20.0, cache=None):
+    # Elke pilaar draait in een eigen (daemon) thread, zodat een trage Sonar-call
+    # alleen die ene pilaar kost en niet de hele gate ophoudt.
+    collected = {}
+
+    def worker(name, prefix):
+        try:
+            collected[name] = collect_pillar(name, prefix, base_dir, sonar_timeout=min(10, deadline), cache=cache)
+        except Exception:
+            collected[name] = {"score": 0, "detail": "Collector error", "skipped": True}
+
+    threads = [
+        threading.Thread(target=worker, args=(name, prefix), name=f"pillar-{prefix}", daemon=True)
+        for name, prefix in PILLARS
+    ]
+    for t in threads:
+        t.start()
+
+    # Eén gezamenlijke deadline voor alle pilaren
+    end = time.monotonic() + deadline
+    for t in threads:
+        t.join(max(0, end - time.monotonic()))
+
+    results = dict(collected)
+    for name, _ in PILLARS:
+        if name not in results:
+            results[name] = {"score": 0, "detail": f"Timeout (>{deadline:g}s)", "skipped": True}
+    return results
+
+def compute_indexes(results, exclude_skipped=False):
+    active_cqi = [results[n]["score"] for n in CQI_NAMES if not results[n]["skipped"]]
+    cqi_score = sum(active_cqi) / len(active_cqi) if active_cqi else 0
+    
+    # De gate telt ontbrekende pilaren als 0; de batch (oude artifacts, geen Sonar) niet
+    rqi_names = [n for n, _ in PILLARS if not (exclude_skipped and results[n]["skipped"])]
+    rqi_score = sum(results[n]["score"] for n in rqi_names) / len(rqi_names) if rqi_names else 0
+    return cqi_score, rqi_score
+
+def analyse_trend(cqi_score, rqi_score, db_path):
+    # Vergelijkt deze run met de recente trend; None als numpy of historie ontbreekt
+    try:
+        import quality_trend
+    except ImportError:
+        return None
+    try:
+        conn = history_store.connect(db_path)
+        history_store.import_csv(conn, history_store.LEGACY_CSV)
+        history = quality_trend.load_history(conn, int(os.getenv("TREND_HISTORY_RUNS", "10000")))
+        conn.close()
+    except Exception:
+        return None
+    return quality_trend.analyse(
+        history,
+        [cqi_score, rqi_score],
+        window=int(os.getenv("TREND_WINDOW", "20")),
+        alpha=float(os.getenv("TREND_ALPHA", "0.3")),
+        z_threshold=float(os.getenv("TREND_Z", "3.0")),
+    )
 
 def calculate():
     # 1. Dynamische input vanuit Environment Variables
     version = os.getenv("APP_VERSION", "0.0.0-unknown")
     override_reason = os.getenv("OVERRIDE_REASON", "")
+    artifact_dir = os.getenv("JUDGE_ARTIFACT_DIR", "tests")
     
-    # 2. De 7 Pilaren van Kwaliteit
-    pillars = [
-        ("Entry Check", "entry"),
-        ("Code Quality", "sonar"),
-        ("Functionality", "accuracy"),
-        ("Security Scan", "security"),
-        ("Performance", "perform"),
-        ("Load Stability", "load"),
-        ("Chaos Resilience", "chaos")
-    ]
-    
-    results = {}
-
-    # 3. Data verzamelen
-    for name, prefix in pillars:
-        if name == "Code Quality":
-            status = get_sonar_status()
-            results[name] = {
-                "score": 100 if status == "OK" else 0, 
-                "detail": f"Sonar: {status}", 
-                "skipped": status == "UNKNOWN"
-            }
-            continue
-
-        file_path = f"tests/{prefix}_results.json"
-        if os.path.exists(file_path):
-            try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                    score = data.get('score', 0)
-                    
-                    # Detail extractie per type test
-                    if prefix == 'entry':
-                        detail = data.get('detail', 'Up')
-                    elif prefix == 'accuracy':
-                        detail = f"Acc: {score}%"
-                    elif prefix == 'security':
-                        # Trivy JSON parsing
-                        results_list = data.get('Results', [])
-                        vulns = 0
-                        for r in results_list:
-                            vulns += len(r.get('Vulnerabilities', []))
-                        score = max(0, 100 - (vulns * 10))
-                        detail = f"{vulns} issues"
-                    else:
-                        detail = f"Score: {score}%"
-                    
-                    results[name] = {"score": score, "detail": detail, "skipped": False}
-            except:
-                results[name] = {"score": 0, "detail": "Format error", "skipped": True}
-        else:
-            results[name] = {"score": 0, "detail": "Skipped", "skipped": True}
+    concurrent = os.getenv("JUDGE_CONCURRENT", "false").lower() in ("1", "true", "yes")
+    deadline = float(os.getenv("JUDGE_DEADLINE", "20"))
+    incremental = os.getenv("JUDGE_INCREMENTAL", "false").lower() in ("1", "true", "yes")
+    cache = PillarCache(os.getenv("JUDGE_CACHE_FILE", DEFAULT_CACHE_FILE)) if incremental else None
+
+    # 2. + 3. Data verzamelen (sequentieel of parallel onder één deadline)
+    if concurrent:
+        results = collect_concurrent(artifact_dir, deadline, cache)
+    else:
+        results = collect_sequential(artifact_dir, cache)
+
+    if cache is not None:
+        try:
+            cache.save()
+        except OSError as e:
+            print(f"⚠️ Judge-cache niet opgeslagen: {e}")
 
     # 4. CQI & RQI Berekening
-    cqi_names = ["Entry Check", "Code Quality", "Functionality", "Security Scan"]
-    active_cqi = [results[n]["score"] for n in cqi_names if not results[n]["skipped"]]
-    cqi_score = sum(active_cqi) / len(active_cqi) if active_cqi else 0
-    
-    rqi_score = sum(results[n]["score"] for n, _ in pillars) / len(pillars)
+    cqi_score, rqi_score = compute_indexes(results)
+
+    # 4b. Trendanalyse t.o.v. eerdere runs (vóór deze run wordt gelogd)
+    history_db = os.getenv("QUALITY_HISTORY_DB", history_store.DEFAULT_DB)
+    trend = analyse_trend(cqi_score, rqi_score, history_db)
+    trend_gate = os.getenv("TREND_GATE", "true").lower() in ("1", "true", "yes")
 
     # 5. Dashboard Output
     print("\n" + "="*60)
@@ -87,9 +233,11 @@ def calculate():
     print("="*60)
     print(f" 🛠️  CQI (Code Quality Index)   : {cqi_score:>5.1f} / 100")
     print(f" 🚢 RQI (Release Quality Index): {rqi_score:>5.1f} / 100")
+    if cache is not None:
+        print(f" ♻️  Incrementeel: {cache.hits} hergebruikt, {cache.misses} opnieuw geparsed")
     print("-" * 60)
 
-    for name, _ in pillars:
+    for name, _ in PILLARS:
         res = results[name]
         if res["skipped"]:
             emoji = "⚪"
@@ -100,12 +248,25 @@ def calculate():
         else:
             emoji = "🔴"
         print(f"{emoji} {name:<20} : {res['score']:>3}/100 ({res['detail']})")
+
+    print("-" * 60)
+    if trend is None:
+        print(" 📈 Trend: overgeslagen (geen numpy of historie)")
+    elif not trend["enough_history"]:
+        print(f" 📈 Trend: te weinig historie ({trend['runs']} runs)")
+    else:
+        print(f" 📈 Trend over {trend['runs']} runs (venster {trend['window']})")
+        for i, label in enumerate(("CQI", "RQI")):
+            marker = "⚠️ regressie" if trend["flagged"][i] else ""
+            print(f"    {label}: gem {trend['mean'][i]:>5.1f} ± {trend['std'][i]:>4.1f} | "
+                  f"EWMA {trend['ewma'][i]:>5.1f} | z {trend['z'][i]:>+5.1f} {marker}")
     
     print("="*60)
 
     # 6. Besluitvorming (Quality Gate)
-    threshold = 80.0
-    is_passed = rqi_score >= threshold
+    threshold = THRESHOLD
+    is_regression = bool(trend and trend["regression"] and trend_gate)
+    is_passed = rqi_score >= threshold and not is_regression
 
     if override_reason:
         print(f" ✅ STATUS: PASSED BY OVERRIDE")
@@ -113,17 +274,22 @@ def calculate():
     elif is_passed:
         print(f" ✅ STATUS: PASSED")
         final_status = "PASS"
+    elif rqi_score >= threshold:
+        print(f" ❌ STATUS: FAILED (duidelijk onder de trend, z < -{os.getenv('TREND_Z', '3.0')})")
+        final_status = "FAIL"
     else:
         print(f" ❌ STATUS: FAILED (RQI below {threshold}%)")
         final_status = "FAIL"
     print("="*60 + "\n")
 
-    # 7. Historie Loggen
+    # 7. Historie Loggen (SQLite; de oude CSV wordt eenmalig gemigreerd)
     try:
-        with open("quality_history.csv", "a") as f:
-            f.write(f"{version},{cqi_score:.1f},{rqi_score:.1f},{final_status},\"{override_reason}\"\n")
-    except:
-        pass
+        conn = history_store.connect(history_db)
+        history_store.import_csv(conn, history_store.LEGACY_CSV)
+        history_store.record_run(conn, version, cqi_score, rqi_score, final_status, override_reason)
+        conn.close()
+    except Exception as e:
+        print(f"⚠️ Historie niet opgeslagen: {e}")
 
     # Exit code voor de pipeline
     if not is_passed and not override_reason:
@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+# Gedeelde Playwright-fixtures voor de entry-suite: één browser en één context per
+# sessie (pytest-playwright levert de session-scoped `browser`), per test alleen een
+# nieuwe pagina. Daarnaast sharding: --shard-count/--shard-index verdelen de tests
+# deterministisch over processen (zie tests/run_entry_shards.py).
+# Sharding en de shard-samenvatting gelden alleen voor de entry-suite; unit-tests
+# (trivy, historie, geo, ...) in dezelfde map draaien altijd volledig en zonder samenvatting.
+
+ENTRY_MODULES = {"test_entry.py"}
+
+def is_entry_item(item):
+    return item.path.name in ENTRY_MODULES
+
+def pytest_addoption(parser):
+    group = parser.getgroup("entry shards")
+    group.addoption("--shard-count", type=int, default=1, help="Aantal shards waarover de entry-suite verdeeld wordt")
+    group.addoption("--shard-index", type=int, default=0, help="Welke shard dit proces draait (0-based)")
+
+def pytest_collection_modifyitems(config, items):
+    entry = [item for item in items if is_entry_item(item)]
+    config._entry_nodeids = {item.nodeid for item in entry}
+    count = config.getoption("--shard-count")
+    index = config.getoption("--shard-index")
+    if count <= 1 or not entry:
+        return
+    if not 0 <= index < count:
+        raise pytest.UsageError(f"--shard-index moet tussen 0 en {count - 1} liggen")
+    # Round-robin over de gesorteerde node-ids: elk proces ziet dezelfde verdeling
+    order = {nodeid: i for i, nodeid in enumerate(sorted(config._entry_nodeids))}
+    deselected = [item for item in entry if order[item.nodeid] % count != index]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        dropped = {item.nodeid for item in deselected}
+        items[:] = [item for item in items if item.nodeid not in dropped]
+        config._entry_nodeids -= dropped
+
+def pytest_sessionstart(session):
+    session.config._shard_started = time.perf_counter()
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    entry = getattr(config, "_entry_nodeids", None)
+    if not entry:
+        return
+    elapsed = time.perf_counter() - config._shard_started
+    count = config.getoption("--shard-count")
+    tests = sum(1 for outcome in ("passed", "failed", "skipped", "error")
+                for report in terminalreporter.stats.get(outcome, []) if report.nodeid in entry)
+    label = f"shard {config.getoption('--shard-index')}/{count}" if count > 1 else "entry-suite"
+    terminalreporter.write_line(f"⏱️ {label}: {tests} tests in {elapsed:.2f}s")
+
+@pytest.fixture(scope="session")
+def entry_context(browser, browser_context_args):
+    # Warme browser en context, hergebruikt door alle tests in dit proces
+    context = browser.new_context(**browser_context_args)
+    yield context
+    context.close()
+
+@pytest.fixture
+def entry_page(entry_context):
+    page = entry_context.new_page()
+    yield page
+    page.close()
@@ -0,0 +1,61 @@
+import argparse
+import time
+
+import numpy as np
+
+# Coördinaat-nauwkeurigheid van de geocoder: great-circle afstand tussen de
+# verwachte en de ontvangen coördinaten, voor alle scenario's tegelijk.
+
+EARTH_RADIUS_KM = 6371.0088
+DEFAULT_TOLERANCE_KM = 25.0
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(a, dtype=float)) for a in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+def summarize(expected_lat, expected_lon, received_lat, received_lon, tolerance_km=DEFAULT_TOLERANCE_KM, worst=10):
+    # NaN in expected = geen verwachte coördinaten (telt niet mee),
+    # NaN in received = geen coördinaten ontvangen (telt als fout)
+    distance = haversine_km(expected_lat, expected_lon, received_lat, received_lon)
+    has_expected = ~(np.isnan(np.asarray(expected_lat, dtype=float)) | np.isnan(np.asarray(expected_lon, dtype=float)))
+    within = has_expected & (distance <= tolerance_km)
+    measured = distance[has_expected & ~np.isnan(distance)]
+
+    summary = {
+        "tolerance_km": tolerance_km,
+        "checked": int(has_expected.sum()),
+        "within_tolerance": int(within.sum()),
+        "pass_rate": round(float(100.0 * within.sum() / has_expected.sum()), 2) if has_expected.any() else None,
+        "missing": int((has_expected & np.isnan(distance)).sum()),
+    }
+    if measured.size:
+        p50, p95, p99 = np.percentile(measured, [50, 95, 99])
+        summary.update({"p50_km": round(float(p50), 3), "p95_km": round(float(p95), 3),
+                        "p99_km": round(float(p99), 3), "max_km": round(float(measured.max()), 3)})
+        # Grootste afwijkingen, als index in de scenario-volgorde
+        ranked = np.where(has_expected, np.nan_to_num(distance, nan=np.inf), -1.0)
+        top = np.argsort(ranked)[::-1][:worst]
+        summary["worst"] = [{"index": int(i), "distance_km": round(float(distance[i]), 1) if np.isfinite(distance[i]) else None}
+                            for i in top if ranked[i] > tolerance_km]
+    # Per scenario: binnen tolerantie, of geen verwachting om tegen te toetsen
+    return summary, within | ~has_expected
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    lat = rng.uniform(-60, 70, args.rows)
+    lon = rng.uniform(-180, 180, args.rows)
+    # 2% van de antwoorden ligt in een andere stad (~100-2000 km verderop)
+    off = rng.random(args.rows) < 0.02
+    got_lat = lat + rng.normal(0, 0.02, args.rows) + off * rng.uniform(1, 15, args.rows)
+    got_lon = lon + rng.normal(0, 0.02, args.rows)
+
+    start = time.perf_counter()
+    summary, ok = summarize(lat, lon, got_lat, got_lon)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    summary.pop("worst", None)
+    print(f"{args.rows:,} scenario's in {elapsed_ms:.1f} ms: {summary}")
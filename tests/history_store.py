@@ -0,0 +1,131 @@
+import argparse
+import csv
+import os
+import sqlite3
+import time
+
+# Kwaliteitshistorie in SQLite i.p.v. een append-only CSV.
+# Indexen op (version, recorded_at) en recorded_at maken "laatste resultaat
+# voor versie X" een O(log n) lookup en tijdvensters een range scan.
+
+DEFAULT_DB = "quality_history.db"
+LEGACY_CSV = "quality_history.csv"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    recorded_at REAL NOT NULL,
+    version TEXT NOT NULL,
+    cqi REAL NOT NULL,
+    rqi REAL NOT NULL,
+    status TEXT NOT NULL,
+    override_reason TEXT NOT NULL DEFAULT '',
+    source TEXT NOT NULL DEFAULT 'judge'
+);
+CREATE INDEX IF NOT EXISTS idx_runs_version_time ON runs (version, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_runs_time ON runs (recorded_at);
+"""
+
+def connect(path=DEFAULT_DB):
+    # Bv. $HOME/.cache/weather-judge op een verse runner
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+def record_run(conn, version, cqi, rqi, status, override_reason="", recorded_at=None, source="judge"):
+    with conn:
+        conn.execute(
+            "INSERT INTO runs (recorded_at, version, cqi, rqi, status, override_reason, source) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (recorded_at if recorded_at is not None else time.time(),
+             version, round(cqi, 1), round(rqi, 1), status, override_reason or "", source),
+        )
+
+def record_runs(conn, runs, source="judge"):
+    # Meerdere runs in één transactie (batch judging); runs = dicts zoals record_run,
+    # optioneel met een eigen recorded_at (bv. de mtime van de artifacts)
+    now = time.time()
+    with conn:
+        conn.executemany(
+            "INSERT INTO runs (recorded_at, version, cqi, rqi, status, override_reason, source) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(run.get("recorded_at", now), run["version"], round(run["cqi"], 1), round(run["rqi"], 1),
+              run["status"], run.get("override_reason") or "", source) for run in runs],
+        )
+
+def latest_for_version(conn, version):
+    row = conn.execute(
+        "SELECT * FROM runs WHERE version = ? ORDER BY recorded_at DESC, id DESC LIMIT 1",
+        (version,),
+    ).fetchone()
+    return dict(row) if row else None
+
+def runs_between(conn, since=None, until=None):
+    # Range scan over de tijd-index; levert rijen lazy op
+    since = since if since is not None else float("-inf")
+    until = until if until is not None else float("inf")
+    cursor = conn.execute(
+        "SELECT * FROM runs WHERE recorded_at >= ? AND recorded_at < ? ORDER BY recorded_at, id",
+        (since, until),
+    )
+    for row in cursor:
+        yield dict(row)
+
+def import_csv(conn, csv_path=LEGACY_CSV):
+    # Migreert de oude quality_history.csv (versie,cqi,rqi,status,"reden").
+    # De CSV heeft geen tijdstempels: alle rijen krijgen de mtime van het bestand,
+    # de volgorde blijft bewaard via de oplopende id.
+    if not os.path.exists(csv_path):
+        return 0
+    if conn.execute("SELECT 1 FROM runs WHERE source = 'csv' LIMIT 1").fetchone():
+        return 0
+
+    recorded_at = os.path.getmtime(csv_path)
+    rows = []
+    with open(csv_path, "r", newline="") as f:
+        for fields in csv.reader(f):
+            if len(fields) < 4:
+                continue
+            try:
+                cqi, rqi = float(fields[1]), float(fields[2])
+            except ValueError:
+                continue
+            reason = ",".join(fields[4:]).strip() if len(fields) > 4 else ""
+            rows.append((recorded_at, fields[0], cqi, rqi, fields[3], reason, "csv"))
+
+    with conn:
+        conn.executemany(
+            "INSERT INTO runs (recorded_at, version, cqi, rqi, status, override_reason, source) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+    return len(rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=DEFAULT_DB)
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_import = sub.add_parser("import", help="Importeer de oude quality_history.csv")
+    p_import.add_argument("csv_path", nargs="?", default=LEGACY_CSV)
+    p_latest = sub.add_parser("latest", help="Laatste resultaat voor een versie")
+    p_latest.add_argument("version")
+    p_range = sub.add_parser("range", help="Alle runs binnen een tijdvenster (epoch seconden)")
+    p_range.add_argument("--since", type=float)
+    p_range.add_argument("--until", type=float)
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    if args.command == "import":
+        print(f"📥 {import_csv(conn, args.csv_path)} rijen geïmporteerd uit {args.csv_path}")
+    elif args.command == "latest":
+        row = latest_for_version(conn, args.version)
+        print(row if row else f"Geen runs voor versie {args.version}")
+    else:
+        for row in runs_between(conn, args.since, args.until):
+            print(f"{row['recorded_at']:.0f} {row['version']:<16} CQI {row['cqi']:>5.1f} RQI {row['rqi']:>5.1f} {row['status']}")
@@ -0,0 +1,98 @@
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Kleine keep-alive connection pool op basis van http.client.
+# Threads delen de pool; per host worden idle verbindingen hergebruikt, zodat
+# niet elke request een nieuwe TCP-verbinding opent.
+
+class PooledResponse:
+    def __init__(self, status, headers, body, timings=None):
+        self.status_code = status
+        self.headers = headers
+        self.content = body
+        # connect_ms (0 bij een hergebruikte verbinding), ttfb_ms en total_ms
+        self.timings = timings or {}
+
+    def json(self):
+        return json.loads(self.content)
+
+class HttpPool:
+    def __init__(self, maxsize=16, timeout=5.0):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+        self.created = 0
+
+    def _key(self, parts):
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        return parts.scheme, parts.hostname, port
+
+    def _checkout(self, key, timeout):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                conn = idle.pop()
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+            self.created += 1
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, port, timeout=timeout), False
+
+    def _checkin(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.maxsize:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def get(self, url, timeout=None, headers=None):
+        timeout = self.timeout if timeout is None else timeout
+        parts = urlsplit(url)
+        key = self._key(parts)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        start = time.perf_counter()
+        conn, reused = self._checkout(key, timeout)
+        connect_ms = 0.0
+        try:
+            if conn.sock is None:
+                conn.connect()
+                connect_ms = (time.perf_counter() - start) * 1000
+            conn.request("GET", path, headers=headers or {})
+            response = conn.getresponse()
+            ttfb_ms = (time.perf_counter() - start) * 1000
+            body = response.read()
+            total_ms = (time.perf_counter() - start) * 1000
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            if not reused:
+                raise
+            # Server sloot een idle keep-alive verbinding: één keer opnieuw op een verse
+            return self.get(url, timeout, headers)
+        except Exception:
+            conn.close()
+            raise
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._checkin(key, conn)
+        timings = {"connect_ms": round(connect_ms, 3), "ttfb_ms": round(ttfb_ms, 3), "total_ms": round(total_ms, 3)}
+        return PooledResponse(response.status, dict(response.getheaders()), body, timings)
+
+    def close(self):
+        with self._lock:
+            for idle in self._idle.values():
+                for conn in idle:
+                    conn.close()
+            self._idle.clear()
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import threading
+import zlib
+
+# Record/replay-store voor HTTP-verkeer van de location- en entry-tests.
+# Bodies worden content-addressed (sha256, zlib) opgeslagen onder objects/,
+# zodat identieke antwoorden (bv. dezelfde forecast) maar één keer op disk staan.
+# index.jsonl koppelt sha256(method + URL) aan status, headers, body-digest en timings;
+# latere regels overschrijven eerdere bij opnieuw opnemen.
+
+SKIP_HEADERS = {"connection", "content-length", "content-encoding", "date", "keep-alive", "transfer-encoding"}
+BODY_CACHE_SIZE = 256
+
+def request_key(method, url):
+    return hashlib.sha256(f"{method.upper()} {url}".encode("utf-8")).hexdigest()
+
+class HttpStore:
+    def __init__(self, root):
+        self.root = root
+        self.index_path = os.path.join(root, "index.jsonl")
+        self.index = {}
+        self._bodies = {}
+        self._lock = threading.Lock()
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.index[entry["key"]] = entry
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], digest[2:])
+
+    def save(self, method, url, status, headers, body, timings=None):
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        entry = {
+            "key": request_key(method, url),
+            "method": method.upper(),
+            "url": url,
+            "status": status,
+            "headers": {k: v for k, v in headers.items() if k.lower() not in SKIP_HEADERS},
+            "body": digest,
+            "timings": timings or {},
+        }
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(zlib.compress(body, 6))
+                os.replace(tmp, path)
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            self.index[entry["key"]] = entry
+
+    def load(self, method, url):
+        # Geeft (entry, body) terug, of None als dit request nooit is opgenomen
+        entry = self.index.get(request_key(method, url))
+        if entry is None:
+            return None
+        digest = entry["body"]
+        body = self._bodies.get(digest)
+        if body is None:
+            with open(self._object_path(digest), "rb") as f:
+                body = zlib.decompress(f.read())
+            with self._lock:
+                if len(self._bodies) >= BODY_CACHE_SIZE:
+                    self._bodies.clear()
+                self._bodies[digest] = body
+        return entry, body
+
+class RecordingPool:
+    # Wrapper rond HttpPool: echte requests, elk antwoord gaat ook de store in
+    def __init__(self, pool, store):
+        self.pool = pool
+        self.store = store
+
+    def get(self, url, timeout=None, headers=None):
+        response = self.pool.get(url, timeout=timeout, headers=headers)
+        self.store.save("GET", url, response.status_code, response.headers, response.content, response.timings)
+        return response
+
+    def close(self):
+        self.pool.close()
+
+class ReplayPool:
+    # Zelfde interface als HttpPool, maar antwoordt uitsluitend uit de store
+    def __init__(self, store):
+        self.store = store
+
+    def get(self, url, timeout=None, headers=None):
+        from http_pool import PooledResponse
+
+        recorded = self.store.load("GET", url)
+        if recorded is None:
+            raise LookupError(f"niet opgenomen: GET {url}")
+        entry, body = recorded
+        return PooledResponse(entry["status"], dict(entry["headers"]), body, dict(entry["timings"]))
+
+    def close(self):
+        pass
+
+def attach_to_page(page, store, mode):
+    # Playwright: al het browserverkeer van de pagina opnemen of afspelen
+    def handle(route):
+        request = route.request
+        if mode == "replay":
+            recorded = store.load(request.method, request.url)
+            if recorded is None:
+                route.abort()
+                return
+            entry, body = recorded
+            route.fulfill(status=entry["status"], headers=entry["headers"], body=body)
+            return
+        response = route.fetch()
+        body = response.body()
+        store.save(request.method, request.url, response.status, response.headers, body)
+        route.fulfill(response=response, body=body)
+
+    page.route("**/*", handle)
@@ -0,0 +1,142 @@
+import argparse
+import json
+import os
+import re
+import time
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import calculate_score as judge
+import history_store
+
+# Batch-Judge voor matrix builds en backfills: beoordeelt vele artifact-mappen
+# (elk een tests/-achtige map met *_results.json) parallel over een process pool.
+# De versie komt uit <root>/VERSION of anders uit de mapnaam.
+# De Sonar-status hoort bij de huidige analyse en niet bij oude artifacts: in de batch
+# telt de Code Quality-pilaar daarom als skipped (of als opgegeven via sonar_result),
+# en skipped pilaren tellen niet mee in de RQI.
+# Elke run krijgt als tijdstip dat van zijn artifacts (metadata of de rapporten zelf;
+# mtimes zijn downloadtijden), zodat een backfill op de juiste plek in de historie
+# landt. De rijen krijgen source="batch" en blijven buiten de trend-baseline.
+# Trendanalyse zit niet in de batch, want die vergelijkt één run met de runs ervoor.
+
+BATCH_SONAR = {"score": 0, "detail": "Skipped (batch)", "skipped": True}
+# Metadata van de gedownloade artifact (bv. created_at uit de GitHub-API)
+ARTIFACT_METADATA = "artifact.json"
+# Tijdstempel in de kop van een rapport: Trivy CreatedAt of een eigen timestamp
+REPORT_TIMESTAMP = re.compile(rb'"(?:CreatedAt|created_at|timestamp)"\s*:\s*("[^"]*"|[0-9.]+)')
+REPORT_HEAD_BYTES = 64 * 1024
+
+SHORT_NAMES = {
+    "Entry Check": "Entry",
+    "Code Quality": "Sonar",
+    "Functionality": "Func",
+    "Security Scan": "Sec",
+    "Performance": "Perf",
+    "Load Stability": "Load",
+    "Chaos Resilience": "Chaos",
+}
+
+def version_for(root):
+    try:
+        with open(os.path.join(root, "VERSION")) as f:
+            version = f.read().strip()
+            if version:
+                return version
+    except OSError:
+        pass
+    return os.path.basename(os.path.normpath(root))
+
+def parse_timestamp(value):
+    # Epoch-seconden of ISO 8601 ("2026-01-17T22:45:00Z", Trivy met nanoseconden); None als onleesbaar
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        value = re.sub(r"(\.\d{6})\d+", r"\1", str(value).strip()).replace("Z", "+00:00")
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+def artifact_time(root):
+    # 1. artifact.json naast de rapporten
+    try:
+        with open(os.path.join(root, ARTIFACT_METADATA)) as f:
+            created = parse_timestamp(json.load(f).get("created_at"))
+        if created is not None:
+            return created
+    except (OSError, ValueError, AttributeError):
+        pass
+    # 2. Tijdstempels in de rapporten; alleen de kop lezen (Trivy-rapporten kunnen groot zijn)
+    stamps = []
+    for _, prefix in judge.PILLARS:
+        try:
+            with open(os.path.join(root, f"{prefix}_results.json"), "rb") as f:
+                match = REPORT_TIMESTAMP.search(f.read(REPORT_HEAD_BYTES))
+        except OSError:
+            continue
+        if match:
+            stamp = parse_timestamp(json.loads(match.group(1)))
+            if stamp is not None:
+                stamps.append(stamp)
+    # 3. Geen tijdstempel bekend: het moment van beoordelen
+    return max(stamps) if stamps else time.time()
+
+def judge_root(root, sonar_result):
+    # Draait in een worker-proces
+    results = {}
+    for name, prefix in judge.PILLARS:
+        if name == "Code Quality":
+            results[name] = dict(sonar_result)
+        else:
+            results[name] = judge.collect_pillar(name, prefix, root)
+    cqi_score, rqi_score = judge.compute_indexes(results, exclude_skipped=True)
+    return {
+        "root": root,
+        "version": version_for(root),
+        "cqi": cqi_score,
+        "rqi": rqi_score,
+        "status": "PASS" if rqi_score >= judge.THRESHOLD else "FAIL",
+        "recorded_at": artifact_time(root),
+        "results": results,
+    }
+
+def judge_many(roots, workers=None, sonar_result=None):
+    if sonar_result is None:
+        sonar_result = BATCH_SONAR
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(judge_root, roots, [sonar_result] * len(roots)))
+
+def print_summary(runs):
+    pillar_cols = " ".join(f"{SHORT_NAMES[name]:>5}" for name, _ in judge.PILLARS)
+    print("\n" + "=" * 96)
+    print(f" {'VERSION':<16} {'CQI':>6} {'RQI':>6} {'STATUS':<6} | {pillar_cols}")
+    print("-" * 96)
+    for run in runs:
+        cells = " ".join(
+            f"{'-' if res['skipped'] else res['score']:>5}"
+            for res in (run["results"][name] for name, _ in judge.PILLARS)
+        )
+        print(f" {run['version']:<16} {run['cqi']:>6.1f} {run['rqi']:>6.1f} {run['status']:<6} | {cells}")
+    print("=" * 96)
+    passed = sum(1 for run in runs if run["status"] == "PASS")
+    print(f" {passed}/{len(runs)} versies boven RQI {judge.THRESHOLD}\n")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("roots", nargs="+", help="Artifact-mappen (één per versie)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--db", default=os.getenv("QUALITY_HISTORY_DB", history_store.DEFAULT_DB))
+    parser.add_argument("--no-history", action="store_true", help="Niets naar de historie schrijven")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    runs = judge_many(args.roots, args.workers)
+    elapsed = time.perf_counter() - start
+    print_summary(runs)
+    print(f" ⏱️  {len(runs)} versies beoordeeld in {elapsed:.2f}s")
+
+    if not args.no_history:
+        # Alle rijen in één transactie
+        conn = history_store.connect(args.db)
+        history_store.record_runs(conn, runs, source="batch")
+        conn.close()
@@ -0,0 +1,102 @@
+import os
+
+# Adapter voor k6 --summary-export (en handleSummary) JSON.
+# Zet http_req_duration-percentielen, de http_req_failed rate en de check rate
+# om in een pilaarscore, gemeten tegen instelbare latency-budgetten.
+
+K6_PREFIXES = ("perf", "load", "chaos")
+
+# Budgetten per pilaar; de standaard volgt de thresholds in performance_test.js / load_test.js.
+# Overschrijfbaar via env, bv. CHAOS_P95_BUDGET_MS=800 of K6_MAX_FAIL_RATE=0.02 (alle pilaren).
+DEFAULT_BUDGETS = {
+    "perf": {"p95_ms": 200.0, "p99_ms": 400.0, "max_fail_rate": 0.01, "min_check_rate": 0.95},
+    "load": {"p95_ms": 200.0, "p99_ms": 500.0, "max_fail_rate": 0.01, "min_check_rate": 0.95},
+    "chaos": {"p95_ms": 500.0, "p99_ms": 1500.0, "max_fail_rate": 0.05, "min_check_rate": 0.90},
+}
+
+# Gewichten van de deelscores in de pilaarscore
+WEIGHTS = {"latency": 0.4, "errors": 0.3, "checks": 0.3}
+
+_ENV_NAMES = {
+    "p95_ms": "P95_BUDGET_MS",
+    "p99_ms": "P99_BUDGET_MS",
+    "max_fail_rate": "MAX_FAIL_RATE",
+    "min_check_rate": "MIN_CHECK_RATE",
+}
+
+def budgets_for(prefix):
+    budgets = dict(DEFAULT_BUDGETS.get(prefix, DEFAULT_BUDGETS["perf"]))
+    for key, env_name in _ENV_NAMES.items():
+        value = os.getenv(f"{prefix.upper()}_{env_name}") or os.getenv(f"K6_{env_name}")
+        if value:
+            budgets[key] = float(value)
+    return budgets
+
+def metric_values(data, name):
+    # --summary-export zet de waarden direct op de metric, handleSummary onder "values"
+    metric = data.get("metrics", {}).get(name)
+    if not isinstance(metric, dict):
+        return None
+    return metric.get("values", metric)
+
+def rate_of(values):
+    if values is None:
+        return None
+    if "rate" in values:
+        return float(values["rate"])
+    if "value" in values:
+        return float(values["value"])
+    passes, fails = values.get("passes"), values.get("fails")
+    if passes is not None and fails is not None and passes + fails > 0:
+        return passes / (passes + fails)
+    return None
+
+def ratio_score(measured, budget):
+    # 100 binnen budget, daarna evenredig lager (2x budget = 50)
+    if measured is None or budget <= 0:
+        return None
+    if measured <= budget:
+        return 100.0
+    return 100.0 * budget / measured
+
+def score_summary(data, budgets):
+    # Geeft (score, detail) terug, of None als het geen k6 summary is
+    duration = metric_values(data, "http_req_duration")
+    if duration is None:
+        return None
+
+    p95 = duration.get("p(95)")
+    p99 = duration.get("p(99)")
+    latency_parts = [s for s in (ratio_score(p95, budgets["p95_ms"]), ratio_score(p99, budgets["p99_ms"])) if s is not None]
+    latency_score = min(latency_parts) if latency_parts else 0.0
+
+    fail_rate = rate_of(metric_values(data, "http_req_failed"))
+    if fail_rate is None:
+        error_score = 100.0
+    elif fail_rate <= budgets["max_fail_rate"]:
+        error_score = 100.0
+    else:
+        error_score = 100.0 * budgets["max_fail_rate"] / fail_rate
+
+    check_rate = rate_of(metric_values(data, "checks"))
+    if check_rate is None:
+        check_score = 100.0
+    elif check_rate >= budgets["min_check_rate"]:
+        check_score = 100.0
+    else:
+        check_score = 100.0 * check_rate / budgets["min_check_rate"]
+
+    score = (WEIGHTS["latency"] * latency_score
+             + WEIGHTS["errors"] * error_score
+             + WEIGHTS["checks"] * check_score)
+
+    parts = []
+    if p95 is not None:
+        parts.append(f"p95 {p95:.0f}ms")
+    if p99 is not None:
+        parts.append(f"p99 {p99:.0f}ms")
+    if fail_rate is not None:
+        parts.append(f"err {fail_rate * 100:.1f}%")
+    if check_rate is not None:
+        parts.append(f"checks {check_rate * 100:.0f}%")
+    return int(round(score)), ", ".join(parts) or "k6 summary"
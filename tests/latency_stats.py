@@ -0,0 +1,71 @@
+import bisect
+import math
+
+# Latency-histogram met vaste, logaritmische buckets (~10% breed).
+# Geheugen is constant, ongeacht het aantal samples; percentielen worden
+# geïnterpoleerd binnen de bucket waarin ze vallen.
+
+MIN_MS = 0.1
+MAX_MS = 60_000.0
+GROWTH = 1.1
+BOUNDS = [MIN_MS * GROWTH ** i for i in range(int(math.log(MAX_MS / MIN_MS, GROWTH)) + 2)]
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * (len(BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, ms):
+        self.counts[bisect.bisect_left(BOUNDS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.min = ms if self.min is None else min(self.min, ms)
+        self.max = ms if self.max is None else max(self.max, ms)
+
+    def merge(self, other):
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, q):
+        if not self.count:
+            return None
+        rank = q / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = BOUNDS[i - 1] if i > 0 else 0.0
+                upper = BOUNDS[i] if i < len(BOUNDS) else self.max
+                value = lower + (upper - lower) * max(0.0, rank - seen) / n
+                return min(max(value, self.min), self.max)
+            seen += n
+        return self.max
+
+    def to_dict(self, histogram=True):
+        summary = {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else None,
+            "min": round(self.min, 3) if self.min is not None else None,
+            "p50": _rounded(self.percentile(50)),
+            "p95": _rounded(self.percentile(95)),
+            "p99": _rounded(self.percentile(99)),
+            "max": round(self.max, 3) if self.max is not None else None,
+        }
+        if histogram:
+            # Alleen gevulde buckets; "le" = bovengrens in ms
+            summary["histogram"] = [
+                {"le": round(BOUNDS[i], 3) if i < len(BOUNDS) else None, "count": n}
+                for i, n in enumerate(self.counts) if n
+            ]
+        return summary
+
+def _rounded(value):
+    return round(value, 3) if value is not None else None
@@ -18,6 +18,8 @@ console.log(
 // TEMP UIT // console.log("DEBUG: k6 verwacht nu versie: " + expectedVersion);
 
 export const options = {
+  // p(99) is nodig voor de latency-budgetten van de Judge (k6_summary.py)
+  summaryTrendStats: ["avg", "min", "med", "max", "p(90)", "p(95)", "p(99)"],
   stages: [
     { duration: "1m", target: 20 }, // Ramping up: van 0 naar 20 gebruikers
     { duration: "1m", target: 20 }, // Steady state: kijken hoe de pods het houden
@@ -1,61 +1,236 @@
-import requests
 import json
 import argparse
+import os
+import time
+from array import array
+from urllib.parse import quote
 
-def run_location_test(url, output_path):
-    # De 'Blacklist' van lastige locaties
-    test_cases = [
-        {"city": "Athens", "expected_country": "GR"},
-        {"city": "Oslo", "expected_country": "NO"},
-        {"city": "London", "expected_country": "GB"}
-    ]
-    
-    results = {
-        "test_name": "Location Accuracy & Mapping",
-        "scenarios": [],
-        "score": 100
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cities.jsonl")
+
+def iter_corpus(path):
+    # Leest de testcases lazy, één JSON-object per regel (lege regels en # worden overgeslagen)
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            case = json.loads(line)
+            if "city" not in case or "expected_country" not in case:
+                raise ValueError(f"{path}:{line_no}: 'city' en 'expected_country' zijn verplicht")
+            yield case
+
+def check_city(pool, url, case, timeout):
+    city = case["city"]
+    response = pool.get(f"{url}/weather?city={quote(city)}", timeout=timeout)
+    data = response.json()
+
+    # Check de country code in de response
+    received_country = data.get('sys', {}).get('country', 'UNKNOWN')
+
+    status = "PASS" if received_country == case["expected_country"] else "FAIL"
+
+    return {
+        "input": city,
+        "expected": case["expected_country"],
+        "received": received_country,
+        "received_coord": received_coord(data),
+        "status": status,
+        "timings": response.timings
     }
 
-    print(f"🌍 Start Locatie-test op: {url}")
-
-    for case in test_cases:
-        city = case["city"]
-        try:
-            response = requests.get(f"{url}/weather?city={city}", timeout=5)
-            data = response.json()
-            
-            # Check de country code in de response
-            received_country = data.get('sys', {}).get('country', 'UNKNOWN')
-            
-            status = "PASS" if received_country == case["expected_country"] else "FAIL"
-            
-            results["scenarios"].append({
-                "input": city,
-                "expected": case["expected_country"],
-                "received": received_country,
-                "status": status
-            })
-
-            if status == "FAIL":
-                results["score"] -= 20 # Strafpunten per foute mapping
-                print(f"❌ FOUT: {city} gaf {received_country}, verwachtte {case['expected_country']}")
-
-        except Exception as e:
-            print(f"⚠️ Kon {city} niet testen: {e}")
-            results["score"] -= 10
-
-    # Score kan niet onder 0
-    results["score"] = max(0, results["score"])
-
-    # Schrijf weg naar de root voor de Judge
+def received_coord(data):
+    # OpenWeather-vorm (coord.lat/lon) of Open-Meteo-vorm (latitude/longitude)
+    coord = data.get('coord') or {}
+    lat, lon = coord.get('lat', data.get('latitude')), coord.get('lon', data.get('longitude'))
+    try:
+        return [float(lat), float(lon)]
+    except (TypeError, ValueError):
+        return None
+
+def score_coordinates(coords, country_ok, tolerance_km):
+    # Afstand tot de verwachte coördinaten voor alle scenario's in één NumPy-pass;
+    # zonder NumPy blijft de score puur op landcode gebaseerd
+    try:
+        import numpy as np
+        from geo_accuracy import summarize
+    except ImportError:
+        return None, None
+    columns = [np.frombuffer(column, dtype=np.float64) for column in coords]
+    summary, within = summarize(*columns, tolerance_km=tolerance_km)
+    passed = int((np.frombuffer(country_ok, dtype=np.int8).astype(bool) & within).sum())
+    return summary, passed
+
+def make_pool(workers, timeout, record=None, replay=None):
+    # Pool pas hier laden (http.client trekt ssl mee)
+    if replay:
+        from http_record import HttpStore, ReplayPool
+        return ReplayPool(HttpStore(replay))
+
+    from http_pool import HttpPool
+    pool = HttpPool(maxsize=workers, timeout=timeout)
+    if record:
+        from http_record import HttpStore, RecordingPool
+        return RecordingPool(pool, HttpStore(record))
+    return pool
+
+def run_scenarios(url, test_cases, workers=8, deadline=30.0, timeout=5.0, pool=None):
+    # Concurrente runner: gedeelde keep-alive pool, maximaal `workers` requests
+    # tegelijk en één deadline voor de hele run. Levert (case, scenario, fout) op.
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    pool = pool or make_pool(workers, timeout)
+    end = time.monotonic() + deadline
+    cases = iter(test_cases)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="location")
+    pending = {}
+
+    def submit_next():
+        case = next(cases, None)
+        if case is None:
+            return False
+        remaining = max(0.1, min(timeout, end - time.monotonic()))
+        pending[executor.submit(check_city, pool, url, case, remaining)] = case
+        return True
+
+    try:
+        # Nooit meer dan 2x workers cases tegelijk in het geheugen
+        while len(pending) < workers * 2 and submit_next():
+            pass
+        while pending:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                case = pending.pop(future)
+                try:
+                    yield case, future.result(), None
+                except Exception as e:
+                    yield case, None, e
+                submit_next()
+
+        # Deadline verlopen: alles wat nog loopt of wacht telt als niet getest
+        expired = TimeoutError(f"deadline van {deadline:g}s verlopen")
+        for case in list(pending.values()):
+            yield case, None, expired
+        for case in cases:
+            yield case, None, expired
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        pool.close()
+
+class TargetStats:
+    # Telt resultaten van één target: counts, latency per fase en coördinaten.
+    # Verwachte en ontvangen coördinaten staan als compacte float64-kolommen (NaN = onbekend),
+    # in dezelfde volgorde als de scenario's in de output
+    def __init__(self):
+        from latency_stats import LatencyHistogram
+
+        self.counts = {"total": 0, "passed": 0, "failed": 0, "errors": 0}
+        self.latency = {phase: LatencyHistogram() for phase in ("connect_ms", "ttfb_ms", "total_ms")}
+        self.coords = [array('d') for _ in range(4)]
+        self.country_ok = array('b')
+
+    def add(self, case, scenario, error):
+        self.counts["total"] += 1
+        if error is not None:
+            self.counts["errors"] += 1
+            return
+        for phase, histogram in self.latency.items():
+            histogram.add(scenario["timings"][phase])
+        nan = float("nan")
+        got = scenario["received_coord"] or (nan, nan)
+        for column, value in zip(self.coords, (case.get("lat", nan), case.get("lon", nan), got[0], got[1])):
+            column.append(value)
+        self.country_ok.append(scenario["status"] == "PASS")
+        self.counts["failed" if scenario["status"] == "FAIL" else "passed"] += 1
+
+    def finish(self, tolerance_km):
+        counts = self.counts
+        # Een stad is pas correct als land én coördinaten (binnen de tolerantie) kloppen
+        coordinates, passed = score_coordinates(self.coords, self.country_ok, tolerance_km)
+        if coordinates is not None:
+            counts["off_target"] = counts["passed"] - passed
+            counts["passed"] = passed
+            counts["failed"] = counts["total"] - counts["errors"] - passed
+
+        # Score = percentage correct gemapte steden; niet-geteste steden tellen als fout
+        score = round(100.0 * counts["passed"] / counts["total"], 1) if counts["total"] else 0
+        # Latency-percentielen per fase; histogram alleen voor de totale tijd
+        latency_summary = {phase: h.to_dict(histogram=(phase == "total_ms")) for phase, h in self.latency.items()}
+        return score, latency_summary, coordinates
+
+def print_summary(stats, score, latency_summary, coordinates, tolerance_km, prefix=""):
+    counts = stats.counts
+    print(f"{prefix}📊 {counts['passed']}/{counts['total']} correct ({score}%), {counts['errors']} niet getest")
+    if coordinates is not None and coordinates["checked"]:
+        print(f"{prefix}📍 {coordinates['pass_rate']}% binnen {tolerance_km:g} km "
+              f"(p50 {coordinates.get('p50_km', 0):.1f} km | p95 {coordinates.get('p95_km', 0):.1f} km, "
+              f"{counts['off_target']} steden in het juiste land maar op de verkeerde plek)")
+    total = latency_summary["total_ms"]
+    if total["count"]:
+        print(f"{prefix}⏱️  p50 {total['p50']:.1f}ms | p95 {total['p95']:.1f}ms | p99 {total['p99']:.1f}ms "
+              f"(TTFB p95 {latency_summary['ttfb_ms']['p95']:.1f}ms, connect p95 {latency_summary['connect_ms']['p95']:.1f}ms)")
+
+def run_location_test(url, output_path, workers=8, deadline=30.0, timeout=5.0, corpus=DEFAULT_CORPUS,
+                      record=None, replay=None, tolerance_km=25.0):
+    stats = TargetStats()
+
+    mode = f", replay uit {replay}" if replay else (f", opname naar {record}" if record else "")
+    print(f"🌍 Start Locatie-test op: {url} (corpus: {corpus}{mode})")
+    pool = make_pool(workers, timeout, record, replay)
+
+    # Scenario's gaan direct naar disk, zodat ook 100k steden in constant geheugen passen
     with open(output_path, 'w') as f:  # Gebruik de variabele in plaats van een hardcoded tekst
-        json.dump(results, f)
+        f.write('{"test_name": "Location Accuracy & Mapping", "scenarios": [')
+
+        for case, scenario, error in run_scenarios(url, iter_corpus(corpus), workers, deadline, timeout, pool):
+            city = case["city"]
+            stats.add(case, scenario, error)
+            counts = stats.counts
+            if error is not None:
+                if counts["errors"] <= 20:
+                    print(f"⚠️ Kon {city} niet testen: {error}")
+                continue
+
+            if counts["passed"] + counts["failed"] > 1:
+                f.write(", ")
+            json.dump(scenario, f)
+            if scenario["status"] == "FAIL" and counts["failed"] <= 20:
+                print(f"❌ FOUT: {city} gaf {scenario['received']}, verwachtte {case['expected_country']}")
+
+        score, latency_summary, coordinates = stats.finish(tolerance_km)
+        f.write('], "score": ' + json.dumps(score) + ', "counts": ' + json.dumps(stats.counts)
+                + ', "latency": ' + json.dumps(latency_summary))
+        if coordinates is not None:
+            f.write(', "coordinates": ' + json.dumps(coordinates))
+        f.write("}")
+
+    print_summary(stats, score, latency_summary, coordinates, tolerance_km)
+    return score
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--url", required=True)
+    parser.add_argument("--url", required=True, nargs="+",
+                        help="Eén of meer targets; meerdere URL's (bv. pod-endpoints) = replica fan-out")
     parser.add_argument("--output", default="functional_results.json") # Voeg deze lijn toe
+    parser.add_argument("--workers", type=int, default=8, help="Maximaal aantal gelijktijdige requests")
+    parser.add_argument("--deadline", type=float, default=30.0, help="Deadline voor de hele run (s)")
+    parser.add_argument("--timeout", type=float, default=5.0, help="Timeout per request (s)")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="JSONL met één testcase per regel")
+    parser.add_argument("--tolerance-km", type=float, default=25.0,
+                        help="Maximale afstand tot de verwachte coördinaten (km)")
+    traffic = parser.add_mutually_exclusive_group()
+    traffic.add_argument("--record", metavar="DIR", help="Sla alle request/response-paren op in DIR")
+    traffic.add_argument("--replay", metavar="DIR", help="Speel af uit DIR, zonder netwerk")
     args = parser.parse_args()
-    
-    # Roep de functie aan en geef het output pad door
-    run_location_test(args.url, args.output)
\ No newline at end of file
+
+    if len(args.url) > 1:
+        if args.record or args.replay:
+            parser.error("--record/--replay werkt met één --url")
+        from replica_fanout import run_fanout
+        run_fanout(args.url, args.output, args.workers, args.deadline, args.timeout, args.corpus, args.tolerance_km)
+    else:
+        # Roep de functie aan en geef het output pad door
+        run_location_test(args.url[0], args.output, args.workers, args.deadline, args.timeout, args.corpus,
+                          args.record, args.replay, args.tolerance_km)
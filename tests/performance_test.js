@@ -5,6 +5,8 @@ import { check, sleep } from "k6";
 const versionPattern = /2\.0\.\d+/;
 
 export const options = {
+  // p(99) is nodig voor de latency-budgetten van de Judge (k6_summary.py)
+  summaryTrendStats: ["avg", "min", "med", "max", "p(90)", "p(95)", "p(99)"],
   vus: 10,
   duration: "30s",
   thresholds: {
@@ -0,0 +1,58 @@
+import hashlib
+import json
+import os
+import threading
+
+# Cache voor de incrementele Judge: per inputbestand de content-hash plus het
+# geparste pilaarresultaat. Bij een rerun worden alleen pilaren waarvan het
+# artifact (of de scoringsconfig) veranderd is opnieuw geëvalueerd.
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_FILE = os.path.join(".cache", "judge", "pillars.json")
+
+def file_digest(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class PillarCache:
+    def __init__(self, path=DEFAULT_CACHE_FILE):
+        self.path = path
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.entries = data.get("entries", {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, file_path, digest, fingerprint):
+        entry = self.entries.get(os.path.abspath(file_path))
+        with self._lock:
+            if entry and entry["digest"] == digest and entry["fingerprint"] == fingerprint:
+                self.hits += 1
+                return dict(entry["result"])
+            self.misses += 1
+        return None
+
+    def put(self, file_path, digest, fingerprint, result):
+        with self._lock:
+            self.entries[os.path.abspath(file_path)] = {
+                "digest": digest,
+                "fingerprint": fingerprint,
+                "result": dict(result),
+            }
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with self._lock:
+            with open(tmp, "w") as f:
+                json.dump({"version": CACHE_VERSION, "entries": self.entries}, f)
+        os.replace(tmp, self.path)
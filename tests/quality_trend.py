@@ -0,0 +1,106 @@
+import argparse
+import time
+
+import numpy as np
+
+# Trendanalyse over de kwaliteitshistorie (CQI en RQI tegelijk, kolom per index).
+# Rolling mean/std, EWMA en z-scores worden in één gevectoriseerde pass berekend,
+# zodat ook 100k runs binnen enkele milliseconden geanalyseerd zijn.
+
+INDEXES = ("CQI", "RQI")
+
+# Baseline = normale, geslaagde pipeline-runs (en de gemigreerde CSV); batch-backfills
+# en FAIL/OVERRIDDEN-runs zouden gemiddelde en spreiding omlaag trekken
+PIPELINE_SOURCES = ("judge", "csv")
+BASELINE_STATUSES = ("PASS",)
+
+def load_history(conn, limit=10_000, sources=PIPELINE_SOURCES, statuses=BASELINE_STATUSES):
+    # Laatste `limit` runs in chronologische volgorde als (n, 2) array [cqi, rqi]
+    source_marks = ", ".join("?" * len(sources))
+    status_marks = ", ".join("?" * len(statuses))
+    rows = conn.execute(
+        "SELECT cqi, rqi FROM (SELECT id, recorded_at, cqi, rqi FROM runs "
+        f"WHERE source IN ({source_marks}) AND status IN ({status_marks}) "
+        "ORDER BY recorded_at DESC, id DESC LIMIT ?) ORDER BY recorded_at, id",
+        (*sources, *statuses, limit),
+    ).fetchall()
+    return np.array(rows, dtype=float).reshape(-1, 2)
+
+def rolling_mean_std(x, window):
+    # Statistiek over het venster dat eindigt op (en inclusief) elk punt
+    n = x.shape[0]
+    zero = np.zeros((1,) + x.shape[1:])
+    c1 = np.concatenate((zero, np.cumsum(x, axis=0)))
+    c2 = np.concatenate((zero, np.cumsum(x * x, axis=0)))
+    end = np.arange(1, n + 1)
+    start = np.maximum(0, end - window)
+    count = (end - start).reshape((-1,) + (1,) * (x.ndim - 1))
+    mean = (c1[end] - c1[start]) / count
+    var = np.maximum((c2[end] - c2[start]) / count - mean * mean, 0.0)
+    return mean, np.sqrt(var)
+
+def ewma(x, alpha):
+    # EWMA zonder Python-loop per punt: per blok een geschaalde cumsum,
+    # met blokken zo groot dat decay**-k niet overflowt.
+    out = np.empty_like(x, dtype=float)
+    n = x.shape[0]
+    if n == 0:
+        return out
+    if alpha >= 1.0:
+        out[:] = x
+        return out
+    decay = 1.0 - alpha
+    block = max(1, int(300 / -np.log10(decay)))
+    prev = x[0].astype(float)
+    for start in range(0, n, block):
+        seg = x[start:start + block]
+        pw = decay ** np.arange(1, seg.shape[0] + 1)
+        pw = pw.reshape((-1,) + (1,) * (x.ndim - 1))
+        out[start:start + seg.shape[0]] = pw * (prev + alpha * np.cumsum(seg / pw, axis=0))
+        prev = out[start + seg.shape[0] - 1]
+    return out
+
+def analyse(history, current, window=20, alpha=0.3, z_threshold=3.0, min_std=1.0, min_runs=10):
+    # history: (n, k) array, current: k waarden van deze run (zelfde kolomvolgorde)
+    x = np.asarray(history, dtype=float)
+    if x.ndim == 1:
+        x = x.reshape(-1, 1)
+    current = np.asarray(current, dtype=float).reshape(-1)
+    n = x.shape[0]
+    if n < min_runs:
+        return {"runs": n, "enough_history": False, "regression": False}
+
+    mean, std = rolling_mean_std(x, window)
+    trend = ewma(x, alpha)
+    # Een vlakke historie (std ~ 0) mag niet elke mini-dip als regressie markeren
+    spread = np.maximum(std, min_std)
+
+    z = (current - mean[-1]) / spread[-1]
+    flagged = z < -z_threshold
+
+    return {
+        "runs": n,
+        "enough_history": True,
+        "window": window,
+        "mean": mean[-1].tolist(),
+        "std": std[-1].tolist(),
+        "ewma": trend[-1].tolist(),
+        "z": z.tolist(),
+        "flagged": flagged.tolist(),
+        "regression": bool(flagged.any()),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    history = np.clip(rng.normal([92.0, 85.0], [3.0, 5.0], size=(args.rows, 2)), 0, 100)
+    analyse(history, [70.0, 60.0])
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        result = analyse(history, [70.0, 60.0])
+    elapsed_ms = (time.perf_counter() - start) * 1000 / args.rounds
+    print(f"{args.rows:,} runs geanalyseerd in {elapsed_ms:.2f} ms (z = {result['z']})")
@@ -0,0 +1,187 @@
+import json
+import statistics
+import tempfile
+import threading
+import zlib
+from array import array
+
+from location_test import DEFAULT_CORPUS, TargetStats, iter_corpus, make_pool, print_summary, run_scenarios
+
+# Fan-out van de locatie-test over meerdere replica's (pods of URL's).
+# Elke target krijgt het volledige corpus in een eigen thread met eigen keep-alive pool.
+# Per target wordt per stad een vingerafdruk (crc32) van het antwoord bijgehouden;
+# een replica die afwijkt van de meerderheid, of een duidelijk hogere p95 heeft, wordt gemarkeerd.
+# Bij een gelijke stand (bv. 2 replica's met elk een ander antwoord) is er geen meerderheid:
+# dan worden alle betrokken replica's gemarkeerd en wordt de stad als "tie" gerapporteerd.
+# De scenario's van alle targets gaan, met een "target"-veld, naar dezelfde "scenarios"-lijst
+# als bij één target; per target eerst naar een tijdelijk bestand, zodat het geheugen constant blijft.
+# Faalt een target zelf (bv. onbereikbaar of een fout in de pool), dan telt die als "failed"
+# met score 0 en worden de overige replica's gewoon onderling vergeleken.
+
+TAIL_RATIO = 1.5     # p95 meer dan 1.5x de mediaan van de andere replica's ...
+TAIL_MIN_MS = 20.0   # ... én minstens 20 ms trager
+MAX_EXAMPLES = 20
+
+def answer_digest(scenario):
+    # 0 = niet getest; coördinaten op ~1 km afgerond zodat float-ruis geen verschil maakt
+    coord = scenario["received_coord"]
+    key = f"{scenario['received']}|{coord[0]:.2f},{coord[1]:.2f}" if coord else scenario["received"]
+    return zlib.crc32(key.encode("utf-8")) or 1
+
+def run_target(url, corpus, workers, deadline, timeout, tolerance_km, result):
+    try:
+        _run_target(url, corpus, workers, deadline, timeout, tolerance_km, result)
+    except Exception as e:
+        if "spool" in result:
+            result["spool"].close()
+        result.clear()
+        result["error"] = f"{type(e).__name__}: {e}"
+
+def _run_target(url, corpus, workers, deadline, timeout, tolerance_km, result):
+    stats = TargetStats()
+    answers = array('L')
+
+    def indexed_cases():
+        for index, case in enumerate(iter_corpus(corpus)):
+            case["_index"] = index
+            yield case
+
+    pool = make_pool(workers, timeout)
+    spool = result["spool"] = tempfile.TemporaryFile("w+", encoding="utf-8")
+    for case, scenario, error in run_scenarios(url, indexed_cases(), workers, deadline, timeout, pool):
+        stats.add(case, scenario, error)
+        index = case["_index"]
+        if len(answers) <= index:
+            answers.extend([0] * (index + 1 - len(answers)))
+        if error is None:
+            answers[index] = answer_digest(scenario)
+            spool.write(json.dumps(dict(scenario, target=url)) + "\n")
+
+    score, latency_summary, coordinates = stats.finish(tolerance_km)
+    result.update({"stats": stats, "answers": answers, "score": score,
+                   "latency": latency_summary, "coordinates": coordinates})
+
+def find_disagreements(answers_per_target):
+    # Per stad het meerderheidsantwoord; telt per target de afwijkingen (niet-geteste steden tellen niet mee).
+    # Gelijke stand tussen de meest gegeven antwoorden: alle targets met een van die antwoorden
+    # tellen ook als afwijkend, zodat de uitkomst niet van de volgorde afhangt.
+    size = max((len(a) for a in answers_per_target), default=0)
+    mismatches = [0] * len(answers_per_target)
+    examples = []
+    for index in range(size):
+        row = [a[index] if index < len(a) else 0 for a in answers_per_target]
+        seen = [answer for answer in row if answer]
+        if len(set(seen)) <= 1:
+            continue
+        votes = {answer: seen.count(answer) for answer in set(seen)}
+        top = max(votes.values())
+        leaders = [answer for answer, count in votes.items() if count == top]
+        tie = len(leaders) > 1
+        majority = None if tie else leaders[0]
+        differing = [t for t, answer in enumerate(row) if answer and answer != majority]
+        for t in differing:
+            mismatches[t] += 1
+        if len(examples) < MAX_EXAMPLES:
+            examples.append((index, differing, tie))
+    return mismatches, examples
+
+def tail_outliers(p95s):
+    # Vergelijk elke replica met de mediaan van de overige
+    flagged = []
+    for t, p95 in enumerate(p95s):
+        others = [v for i, v in enumerate(p95s) if i != t and v is not None]
+        if p95 is None or not others:
+            continue
+        baseline = statistics.median(others)
+        if p95 > baseline * TAIL_RATIO and p95 - baseline > TAIL_MIN_MS:
+            flagged.append(t)
+    return flagged
+
+def run_fanout(urls, output_path, workers=8, deadline=30.0, timeout=5.0, corpus=DEFAULT_CORPUS, tolerance_km=25.0):
+    print(f"🌍 Start Locatie-test op {len(urls)} replica's (corpus: {corpus})")
+    results = [{} for _ in urls]
+    threads = [threading.Thread(target=run_target, name=f"replica-{i}", daemon=True,
+                                args=(url, corpus, workers, deadline, timeout, tolerance_km, results[i]))
+               for i, url in enumerate(urls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Alleen targets met antwoorden vergelijken; indexen daarna terug naar de volledige lijst
+    alive = [i for i, r in enumerate(results) if "answers" in r]
+    for i, result in enumerate(results):
+        if i not in alive:
+            result.setdefault("error", "target leverde geen resultaat")
+    alive_mismatches, examples = find_disagreements([results[i]["answers"] for i in alive])
+    mismatches = [0] * len(urls)
+    for t, count in enumerate(alive_mismatches):
+        mismatches[alive[t]] = count
+    slow = {alive[t] for t in tail_outliers([results[i]["latency"]["total_ms"]["p95"] for i in alive])}
+
+    # Voorbeelden met stadsnaam: één extra pass over het corpus voor alleen de afwijkende indexen
+    wanted = {index: ([alive[t] for t in differing], tie) for index, differing, tie in examples}
+    disagreements = []
+    if wanted:
+        for index, case in enumerate(iter_corpus(corpus)):
+            if index in wanted:
+                differing, tie = wanted[index]
+                disagreements.append({"input": case["city"], "targets": [urls[t] for t in differing], "tie": tie})
+                if len(disagreements) == len(wanted):
+                    break
+
+    targets = []
+    for i, (url, result) in enumerate(zip(urls, results)):
+        if "error" in result:
+            targets.append({"url": url, "score": 0, "error": result["error"], "flags": ["failed"]})
+            print(f"\n🔹 {url} ❌ failed: {result['error']}")
+            continue
+        flags = []
+        if mismatches[i]:
+            flags.append("answers")
+        if i in slow:
+            flags.append("tail_latency")
+        targets.append({"url": url, "score": result["score"], "counts": result["stats"].counts,
+                        "latency": result["latency"], "coordinates": result["coordinates"],
+                        "disagreements": mismatches[i], "flags": flags})
+
+        print(f"\n🔹 {url}{' ⚠️ ' + ', '.join(flags) if flags else ''}")
+        print_summary(result["stats"], result["score"], result["latency"], result["coordinates"], tolerance_km, "   ")
+        if mismatches[i]:
+            print(f"   ⚠️ {mismatches[i]} steden met een ander antwoord dan de meerderheid")
+
+    # De zwakste replica bepaalt de score; latency over alle replica's samen
+    total_stats = TargetStats()
+    for result in (results[i] for i in alive):
+        for phase, histogram in total_stats.latency.items():
+            histogram.merge(result["stats"].latency[phase])
+        for key, value in result["stats"].counts.items():
+            total_stats.counts[key] = total_stats.counts.get(key, 0) + value
+    score = min(t["score"] for t in targets)
+    flagged = [t["url"] for t in targets if t["flags"]]
+
+    # Zelfde vorm als run_location_test ("scenarios" voorop), plus de replica-velden
+    with open(output_path, 'w') as f:
+        f.write('{"test_name": "Location Accuracy & Mapping (replicas)", "scenarios": [')
+        first = True
+        for result in results:
+            spool = result.pop("spool", None)
+            if spool is None:
+                continue
+            spool.seek(0)
+            for line in spool:
+                f.write(line.rstrip("\n") if first else ", " + line.rstrip("\n"))
+                first = False
+            spool.close()
+        f.write('], ' + json.dumps({
+            "score": score,
+            "counts": total_stats.counts,
+            "latency": {phase: h.to_dict(histogram=(phase == "total_ms")) for phase, h in total_stats.latency.items()},
+            "targets": targets,
+            "flagged": flagged,
+            "disagreements": disagreements,
+        })[1:])
+
+    print(f"\n📊 Laagste replica-score: {score}%"
+          + (f" | ⚠️ afwijkend: {', '.join(flagged)}" if flagged else " | replica's consistent"))
+    return score
@@ -0,0 +1,66 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+
+# Draait de entry-suite verdeeld over N pytest-processen (zie --shard-count in conftest.py).
+# Elk proces start één browser en hergebruikt die voor al zijn tests; de totale
+# looptijd per shard wordt gerapporteerd en optioneel als JSON weggeschreven.
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SHARD_LINE = re.compile(r"shard \d+/\d+: (\d+) tests in ([\d.]+)s")
+
+def run_shard(index, shards, target, pytest_args, result):
+    cmd = [sys.executable, "-m", "pytest", target, "-q", f"--shard-count={shards}", f"--shard-index={index}",
+           *pytest_args]
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    # seconds = hele proces incl. browserstart; session_seconds = zoals de shard zelf meet
+    match = SHARD_LINE.search(proc.stdout)
+    result.update({
+        "shard": index,
+        "returncode": proc.returncode,
+        "tests": int(match.group(1)) if match else None,
+        "seconds": round(time.perf_counter() - start, 2),
+        "session_seconds": float(match.group(2)) if match else None,
+        # Exit code 5 = geen tests in deze shard; dat is geen fout
+        "ok": proc.returncode in (0, 5),
+        "output": proc.stdout,
+    })
+
+def run_shards(shards, target, pytest_args=(), output=None):
+    started = time.perf_counter()
+    results = [{} for _ in range(shards)]
+    threads = [threading.Thread(target=run_shard, args=(i, shards, target, pytest_args, results[i]))
+               for i in range(shards)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for r in results:
+        print(f"{'✅' if r['ok'] else '❌'} shard {r['shard']}/{shards}: {r['tests'] or 0} tests, "
+              f"{r['seconds']:.2f}s (exit {r['returncode']})")
+        if not r["ok"]:
+            print(r["output"])
+        del r["output"]
+    wall = time.perf_counter() - started
+    print(f"⏱️ {shards} shards klaar in {wall:.2f}s (langzaamste shard {max(r['seconds'] for r in results):.2f}s)")
+
+    if output:
+        with open(output, "w") as f:
+            json.dump({"wall_seconds": round(wall, 2), "shards": results}, f, indent=2)
+    return all(r["ok"] for r in results)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shards", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--target", default=os.path.join(TESTS_DIR, "test_entry.py"))
+    parser.add_argument("--output", help="Schrijf de looptijd per shard als JSON")
+    args, pytest_args = parser.parse_known_args()
+
+    sys.exit(0 if run_shards(args.shards, args.target, pytest_args, args.output) else 1)
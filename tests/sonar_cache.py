@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import time
+
+# Disk-cache voor SonarCloud quality-gate lookups.
+# Sleutel = projectKey + analysisId (of ceTaskId / commit-SHA); binnen de TTL komt het
+# antwoord direct van schijf, daarna revalideren we conditioneel (If-None-Match /
+# If-Modified-Since). Zonder analyse-sleutel ("latest") wordt nooit op TTL gecachet:
+# een nieuwe analyse mag nooit een oude quality-gate status teruggeven.
+# Is Sonar onbereikbaar, dan vallen we terug op de laatst bekende status.
+
+DEFAULT_HOST = "https://sonarcloud.io"
+DEFAULT_TTL = 600
+DEFAULT_CACHE_DIR = os.path.join(".cache", "sonar")
+DEFAULT_REPORT_TASK = os.path.join(".scannerwork", "report-task.txt")
+
+def cache_path(cache_dir, project_key, analysis_id=None):
+    key = f"{project_key}:{analysis_id or 'latest'}"
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+    return os.path.join(cache_dir, f"{digest}.json")
+
+def read_report_task(path=DEFAULT_REPORT_TASK):
+    # report-task.txt van de scanner: key=value per regel (ceTaskId, dashboardUrl, ...)
+    task = {}
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                key, sep, value = line.strip().partition("=")
+                if sep:
+                    task[key] = value
+    except OSError:
+        pass
+    return task
+
+def resolve_revision(report_task=DEFAULT_REPORT_TASK):
+    # Identificeert de geanalyseerde code voor de cache-sleutel: ceTaskId van de scan,
+    # anders de commit-SHA van de workflow-run
+    return read_report_task(report_task).get("ceTaskId") or os.getenv("GITHUB_SHA") or None
+
+def read_entry(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_entry(path, entry):
+    # Atomisch wegschrijven zodat parallelle Judges nooit een halve file lezen
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(entry, f)
+    os.replace(tmp, path)
+
+def fetch_status(project_key, analysis_id=None, host_url=DEFAULT_HOST, token=None,
+                 ttl=DEFAULT_TTL, cache_dir=DEFAULT_CACHE_DIR, timeout=10, session=None, revision=None):
+    # Geeft (status, bron) terug; bron is "cache", "revalidated", "network" of "stale".
+    # analysis_id gaat mee naar de API; revision (ceTaskId / commit-SHA) is alleen cache-sleutel.
+    key = analysis_id or revision
+    path = cache_path(cache_dir, project_key, key)
+    entry = read_entry(path)
+    now = time.time()
+
+    if key and entry and now - entry.get("fetched_at", 0) < ttl:
+        return entry["status"], "cache"
+
+    params = {"projectKey": project_key}
+    if analysis_id:
+        params["analysisId"] = analysis_id
+    headers = {}
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+
+    if session is None:
+        # requests (urllib3, SSL, charset-detectie) pas laden als we echt het netwerk op moeten
+        import requests
+        session = requests
+    try:
+        response = session.get(f"{host_url.rstrip('/')}/api/qualitygates/project_status",
+                            params=params, headers=headers,
+                            auth=(token, "") if token else None, timeout=timeout)
+        if response.status_code == 304 and entry:
+            entry["fetched_at"] = now
+            write_entry(path, entry)
+            return entry["status"], "revalidated"
+
+        response.raise_for_status()
+        data = response.json()
+        status = "OK" if data['projectStatus']['status'] == "OK" else "ERROR"
+    except Exception:
+        if entry:
+            return entry["status"], "stale"
+        return "UNKNOWN", "network"
+
+    try:
+        write_entry(path, {
+            "project_key": project_key,
+            "analysis_id": analysis_id,
+            "revision": revision,
+            "status": status,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": now,
+        })
+    except OSError:
+        pass
+    return status, "network"
@@ -0,0 +1,83 @@
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Lokale stand-in voor SonarCloud's /api/qualitygates/project_status,
+# zodat de Judge en de Sonar-cache zonder netwerk getest en gebenchmarkt kunnen worden.
+
+class SonarStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        stub = self.server
+        parsed = urlparse(self.path)
+        if parsed.path != "/api/qualitygates/project_status":
+            self._send(404, {"errors": [{"msg": "Unknown url"}]})
+            return
+
+        query = parse_qs(parsed.query)
+        project_key = query.get("projectKey", [""])[0]
+        if not project_key:
+            self._send(400, {"errors": [{"msg": "The 'projectKey' parameter is missing"}]})
+            return
+
+        stub.hits += 1
+        if stub.delay:
+            time.sleep(stub.delay)
+
+        body = {"projectStatus": {"status": stub.status, "conditions": [], "ignoredConditions": False}}
+        analysis_id = query.get("analysisId", [None])[0]
+        etag = '"' + hashlib.sha1(f"{project_key}:{analysis_id}:{stub.status}".encode()).hexdigest()[:16] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            stub.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._send(200, body, {"ETag": etag})
+
+    def _send(self, code, body, headers=None):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+def make_stub(status="OK", delay=0.0, host="127.0.0.1", port=0):
+    server = ThreadingHTTPServer((host, port), SonarStubHandler)
+    server.daemon_threads = True
+    server.status = status
+    server.delay = delay
+    server.hits = 0
+    server.not_modified = 0
+    return server
+
+def start_stub(status="OK", delay=0.0, host="127.0.0.1", port=0):
+    # Start de stub in een achtergrond-thread; geeft (server, base_url) terug
+    server = make_stub(status, delay, host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--status", default="OK", choices=["OK", "ERROR", "WARN"])
+    parser.add_argument("--delay", type=float, default=0.0, help="Kunstmatige latency in seconden")
+    args = parser.parse_args()
+
+    server = make_stub(args.status, args.delay, port=args.port)
+    print(f"🧪 Sonar stand-in op http://127.0.0.1:{args.port} (status {args.status})")
+    print(f"   Gebruik: SONAR_HOST_URL=http://127.0.0.1:{args.port} python3 tests/calculate_score.py")
+    server.serve_forever()
@@ -1,24 +1,93 @@
 import os
-import pytest
+import time
 from playwright.sync_api import Page, expect
+from http_record import HttpStore, attach_to_page
+from browser_metrics import collect_page_metrics, write_entry_results
+from weather_stub import WeatherFixtures, route_upstreams
 
-def test_entry_point_validation(page: Page):
+# HTTP_RECORD_MODE=record slaat al het browserverkeer op in HTTP_STORE,
+# HTTP_RECORD_MODE=replay speelt het daaruit af zonder netwerk
+HTTP_RECORD_MODE = os.getenv('HTTP_RECORD_MODE', '')
+HTTP_STORE = os.getenv('HTTP_STORE', 'tests/http_store')
+ENTRY_RESULTS = os.getenv('ENTRY_RESULTS', 'tests/entry_results.json')
+# Nominatim/Open-Meteo komen standaard uit de fixtures (data2.json/data.json);
+# ENTRY_UPSTREAM=live gebruikt de echte API's. UPSTREAM_LATENCY_MS simuleert een trage upstream.
+ENTRY_UPSTREAM = os.getenv('ENTRY_UPSTREAM', 'fixtures')
+UPSTREAM_LATENCY_MS = float(os.getenv('UPSTREAM_LATENCY_MS', '0'))
+
+_fixtures = []
+
+def prepare_page(page):
+    # Record/replay gaat voor; anders upstream-calls naar de fixtures
+    if HTTP_RECORD_MODE in ('record', 'replay'):
+        attach_to_page(page, HttpStore(HTTP_STORE), HTTP_RECORD_MODE)
+        return None
+    if ENTRY_UPSTREAM != 'live':
+        # Fixtures één keer per proces inlezen
+        if not _fixtures:
+            _fixtures.append(WeatherFixtures())
+        return route_upstreams(page, _fixtures[0], latency_ms=UPSTREAM_LATENCY_MS)
+    return None
+
+def test_entry_point_validation(entry_page: Page):
+    # entry_page komt uit de gedeelde, warme browsercontext (tests/conftest.py)
+    page = entry_page
     # Hij pakt nu TEST_URL uit de GitHub Action, of valt terug op 8080 als je lokaal test
     url = os.getenv('TEST_URL', 'http://localhost:8080')
     
+    prepare_page(page)
+
     print(f"\nValidatie op: {url}")
     page.goto(url)
-    
-    # Check 1: Is de pagina geladen? (Zoekt naar de titel)
-    expect(page).to_have_title("Weather Station Hub")
-    
-    # Check 2: Is de versie-indicator aanwezig?
-    version_tag = page.locator("#version-tag")
-    expect(version_tag).to_be_visible()
-    
-    # Check 3: Is de content dynamisch? (Zoekt naar de stad-input)
-    search_input = page.locator("#city-input")
-    expect(search_input).to_be_visible()
-    
-    versie = version_element = version_tag.inner_text()
-    print(f"✅ Entry Test geslaagd voor versie: {versie}")
\ No newline at end of file
+
+    # Page-load cijfers voor de Judge eerst ophalen, zodat ze ook bij een mislukte check
+    # in het resultaat staan
+    metrics = collect_page_metrics(page)
+    print(f"⏱️ FCP {metrics['fcp_ms']}ms | LCP {metrics['lcp_ms']}ms | {metrics['transferred_bytes']} bytes")
+
+    try:
+        # Check 1: Is de pagina geladen? (Zoekt naar de titel)
+        expect(page).to_have_title("Frontend Mentor | Weather app")
+
+        # Check 2: Is de versie-indicator aanwezig?
+        version_tag = page.locator("#version-tag")
+        expect(version_tag).to_be_visible()
+
+        # Check 3: Is de content dynamisch? (Zoekt naar de stad-input)
+        search_input = page.locator("#search")
+        expect(search_input).to_be_visible()
+    except AssertionError:
+        write_entry_results(ENTRY_RESULTS, "Page check failed", score=0, browser=metrics)
+        raise
+
+    versie = version_tag.inner_text()
+    print(f"✅ Entry Test geslaagd voor versie: {versie}")
+
+    # Naast score/detail van de health-check
+    write_entry_results(ENTRY_RESULTS, f"Page OK ({versie})", browser=metrics)
+
+def test_forecast_render(entry_page: Page):
+    # Zoeken -> daily/hourly forecast gerenderd; met fixtures is dit de eigen rendertijd
+    # van de pagina plus precies UPSTREAM_LATENCY_MS per upstream-call
+    page = entry_page
+    url = os.getenv('TEST_URL', 'http://localhost:8080')
+    served = prepare_page(page)
+    page.goto(url)
+
+    start = time.perf_counter()
+    page.locator("#search").fill("London")
+    page.locator("#search").press("Enter")
+    expect(page.locator("#dailyForecast > *").first).to_be_visible()
+    expect(page.locator("#hourlyForecast > *").first).to_be_visible()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    render = {"search_to_render_ms": round(elapsed_ms, 1),
+              "upstream": 'fixtures' if served is not None else (HTTP_RECORD_MODE or 'live')}
+    if served is not None:
+        render["upstream_latency_ms"] = UPSTREAM_LATENCY_MS
+        # Zonder de geïnjecteerde vertraging blijft de rendertijd van de pagina zelf over
+        calls = sum(served.values())
+        render["upstream_calls"] = calls
+        render["page_render_ms"] = round(max(0.0, elapsed_ms - calls * UPSTREAM_LATENCY_MS), 1)
+    write_entry_results(ENTRY_RESULTS, render=render)
+    print(f"⏱️ Zoeken -> forecast in {elapsed_ms:.0f}ms ({render})")
\ No newline at end of file
@@ -0,0 +1,45 @@
+import io
+import json
+
+from bench_trivy_stream import write_synthetic_report
+from trivy_stream import JsonStream, count_vulnerabilities
+
+# De streaming-lezer moet bij elke chunk-grens hetzelfde opleveren als json.load,
+# ook als een float precies na de "." of "e" wordt afgeknipt.
+
+CHUNK_SIZES = [1, 2, 3, 5, 7, 11, 64, 1000, 64 * 1024]
+
+def expected_counts(path):
+    with open(path, "r") as f:
+        data = json.load(f)
+    by_severity, by_target = {}, {}
+    for result in data.get("Results", []):
+        vulns = result.get("Vulnerabilities", [])
+        for vuln in vulns:
+            by_severity[vuln["Severity"]] = by_severity.get(vuln["Severity"], 0) + 1
+        if vulns:
+            by_target[result["Target"]] = by_target.get(result["Target"], 0) + len(vulns)
+    return {"total": sum(by_target.values()), "by_severity": by_severity, "by_target": by_target}
+
+def test_counts_match_json_load_for_every_chunk_size(tmp_path):
+    path = tmp_path / "security_results.json"
+    write_synthetic_report(str(path), 40, targets=3)
+    expected = expected_counts(path)
+    for chunk_size in CHUNK_SIZES:
+        assert count_vulnerabilities(str(path), chunk_size) == expected, chunk_size
+
+def test_float_split_at_chunk_boundary(tmp_path):
+    # "." en "e" van een float in een overgeslagen sectie precies op de 64 KiB-grens
+    for number in ("1.5", "2e3", "3.25E-2", "-0.5"):
+        for cut in range(1, len(number)):
+            prefix = '{"Metadata": {"pad": "' + "x" * (64 * 1024 - 22 - cut) + '", "n": '
+            doc = prefix + number + '}, "Results": [{"Target": "t", "Vulnerabilities": [{"Severity": "HIGH"}]}]}'
+            path = tmp_path / "report.json"
+            path.write_text(doc)
+            assert count_vulnerabilities(str(path))["by_severity"] == {"HIGH": 1}, (number, cut)
+
+def test_read_value_matches_json_load():
+    doc = json.dumps({"a": [1.5, -2.25e-3, 10, True, None, "x" * 50], "b": {"c": 6.02E23, "d": [0.1] * 20}})
+    for chunk_size in CHUNK_SIZES:
+        stream = JsonStream(io.StringIO(doc), chunk_size)
+        assert stream.read_value() == json.loads(doc), chunk_size
@@ -0,0 +1,150 @@
+import json
+import re
+
+# Incrementele JSON-lezer voor grote Trivy-rapporten.
+# In plaats van het hele document met json.load in te lezen, lopen we de
+# structuur stap voor stap af (object -> sleutels, array -> elementen) en
+# decoderen we alleen losse vulnerabilities. Het geheugengebruik blijft zo
+# begrensd door de chunk-grootte plus één vulnerability.
+
+CHUNK_SIZE = 64 * 1024
+_WS = re.compile(r"[ \t\n\r]*")
+# Wat na een gedecodeerd getal nog bij datzelfde getal kan horen ("12" + ".5e3")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+\-]*")
+_DECODER = json.JSONDecoder()
+
+
+class JsonStream:
+    def __init__(self, fp, chunk_size=CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch):
+        found = self.peek()
+        if found != ch:
+            raise ValueError(f"Expected {ch!r} at offset {self.pos}, got {found!r}")
+        self.pos += 1
+
+    def read_value(self):
+        # Decodeer precies één JSON-waarde; bij een chunk-grens lezen we bij en
+        # proberen opnieuw. Een waarde die tot het einde van de buffer loopt kan
+        # afgekapt zijn, en een getal gevolgd door alleen nog getal-tekens ook
+        # ("12." + "5" decodeert anders als 12), dus dan eerst bijlezen.
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+                is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+                truncated = end == len(self.buf) or (is_number and _NUMBER_TAIL.fullmatch(self.buf, end))
+                if self.eof or not truncated:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self._fill():
+                value, self.pos = _DECODER.raw_decode(self.buf, self.pos)
+                return value
+
+    def iter_object(self):
+        # Levert de sleutels; de aanroeper moet de bijbehorende waarde consumeren
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(":")
+            yield key
+            sep = self.peek()
+            self.pos += 1
+            if sep == "}":
+                return
+            if sep != ",":
+                raise ValueError(f"Unexpected {sep!r} in object at offset {self.pos}")
+
+    def iter_array(self):
+        # Levert één keer per element; de aanroeper moet het element consumeren
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            sep = self.peek()
+            self.pos += 1
+            if sep == "]":
+                return
+            if sep != ",":
+                raise ValueError(f"Unexpected {sep!r} in array at offset {self.pos}")
+
+    def skip_value(self):
+        ch = self.peek()
+        if ch == "{":
+            for _ in self.iter_object():
+                self.skip_value()
+        elif ch == "[":
+            for _ in self.iter_array():
+                self.skip_value()
+        else:
+            self.read_value()
+
+
+def count_vulnerabilities(path, chunk_size=CHUNK_SIZE):
+    # Telt vulnerabilities per severity en per target zonder de boom op te bouwen
+    summary = {"total": 0, "by_severity": {}, "by_target": {}}
+    by_severity = summary["by_severity"]
+    by_target = summary["by_target"]
+
+    with open(path, "r", encoding="utf-8") as f:
+        stream = JsonStream(f, chunk_size)
+        if stream.peek() != "{":
+            raise ValueError("Trivy report must be a JSON object")
+        for key in stream.iter_object():
+            if key != "Results" or stream.peek() != "[":
+                stream.skip_value()
+                continue
+            for _ in stream.iter_array():
+                if stream.peek() != "{":
+                    stream.skip_value()
+                    continue
+                target = "(unknown)"
+                count = 0
+                for rkey in stream.iter_object():
+                    if rkey == "Target":
+                        target = str(stream.read_value())
+                    elif rkey == "Vulnerabilities" and stream.peek() == "[":
+                        for _ in stream.iter_array():
+                            vuln = stream.read_value()
+                            severity = vuln.get("Severity", "UNKNOWN") if isinstance(vuln, dict) else "UNKNOWN"
+                            by_severity[severity] = by_severity.get(severity, 0) + 1
+                            count += 1
+                    else:
+                        stream.skip_value()
+                if count:
+                    by_target[target] = by_target.get(target, 0) + count
+                    summary["total"] += count
+
+    return summary
@@ -0,0 +1,310 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+from urllib.parse import parse_qs, unquote_plus, urlsplit
+
+# Offline stand-in voor de weather-backend (/health en /weather?city=) plus de
+# upstream-routes die script.js gebruikt (Nominatim /search, Open-Meteo /v1/forecast).
+# Antwoorden komen uit de fixtures: data2.json (Nominatim) en data.json (Open-Meteo);
+# steden uit tests/cities.jsonl geven de juiste coördinaten en landcode.
+# route_upstreams() doet hetzelfde binnen Playwright; met gesimuleerde latency gaan de
+# routes via een stand-in in een achtergrondthread, zodat de vertraging per request
+# in de server zit (call_later) en parallelle browser-calls elkaar niet ophouden.
+# Een kale asyncio.Protocol met keep-alive, pipelining en voor-geserialiseerde
+# antwoorden haalt zo tienduizenden requests per seconde op één core.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# normalize_forecast() en de hourly-velden komen uit de gateway, zodat stub en gateway
+# dezelfde vorm teruggeven als script.js verwacht; het antwoordformaat is gedeeld (http_common)
+sys.path.insert(0, os.path.join(ROOT, "gateway"))
+from http_common import http_response, install_fast_loop
+from weather_gateway import HOURLY_FIELDS, normalize_forecast
+FORECAST_FIXTURE = os.path.join(ROOT, "data.json")
+SEARCH_FIXTURE = os.path.join(ROOT, "data2.json")
+CITY_CORPUS = os.path.join(ROOT, "tests", "cities.jsonl")
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_CACHED_RESPONSES = 10_000
+
+def complete_hourly(forecast):
+    # data.json heeft hourly alleen temperature_2m/weather_code; script.js leest ook
+    # wind_speed_10m, apparent_temperature, relative_humidity_2m en precipitation.
+    # Ontbrekende velden krijgen per uur de waarde uit `current`.
+    hourly = forecast.get("hourly") or {}
+    hourly_units = forecast.setdefault("hourly_units", {})
+    current = forecast.get("current") or {}
+    current_units = forecast.get("current_units") or {}
+    hours = len(hourly.get("time") or [])
+    for field in HOURLY_FIELDS.split(","):
+        if field not in hourly and field in current:
+            hourly[field] = [current[field]] * hours
+            hourly_units.setdefault(field, current_units.get(field, ""))
+    return forecast
+
+class WeatherFixtures:
+    def __init__(self, forecast_path=FORECAST_FIXTURE, search_path=SEARCH_FIXTURE, corpus_path=CITY_CORPUS):
+        with open(forecast_path, "r", encoding="utf-8") as f:
+            self.forecast = complete_hourly(normalize_forecast(json.load(f)))
+        with open(search_path, "r", encoding="utf-8") as f:
+            self.search_results = json.load(f)
+
+        # Geocode-index: stadsnaam (lowercase) -> Nominatim-achtig resultaat
+        self.places = {}
+        template = self.search_results[0] if self.search_results else {}
+        if os.path.exists(corpus_path):
+            with open(corpus_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith("#"):
+                        continue
+                    case = json.loads(line)
+                    if "lat" not in case or "lon" not in case:
+                        continue
+                    place = dict(template)
+                    place.update({
+                        "lat": str(case["lat"]),
+                        "lon": str(case["lon"]),
+                        "category": "place",
+                        "type": "city",
+                        "addresstype": "city",
+                        "name": case["city"],
+                        "display_name": f"{case['city']}, {case['expected_country']}",
+                        "address": {"city": case["city"], "country_code": case["expected_country"].lower()},
+                    })
+                    self.places[case["city"].lower()] = place
+
+    def search(self, query):
+        query = query.strip().lower()
+        if query in self.places:
+            return [self.places[query]]
+        # De fixture zelf (data2.json) voor zijn eigen zoekterm
+        matches = [r for r in self.search_results if r.get("name", "").lower() == query]
+        return matches
+
+    def forecast_for(self, lat, lon):
+        forecast = dict(self.forecast)
+        forecast["latitude"] = round(float(lat), 4)
+        forecast["longitude"] = round(float(lon), 4)
+        return forecast
+
+    def weather(self, city):
+        results = self.search(city)
+        if not results:
+            return None
+        place = results[0]
+        country = (place.get("address") or {}).get("country_code", "")
+        body = self.forecast_for(place["lat"], place["lon"])
+        body.update({
+            "name": place.get("name", city),
+            "coord": {"lat": float(place["lat"]), "lon": float(place["lon"])},
+            "sys": {"country": country.upper() or "UNKNOWN"},
+            "location": place,
+        })
+        return body
+
+class WeatherStubApp:
+    def __init__(self, fixtures, delay=0.0):
+        self.fixtures = fixtures
+        # Gesimuleerde upstream-latency (s) per antwoord, bv. om WAN-calls na te bootsen
+        self.delay = delay
+        self.cache = {}
+        self.requests = 0
+
+    def respond(self, method, target, keep_alive):
+        self.requests += 1
+        key = (method, target, keep_alive)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        response = self._build(method, target, keep_alive)
+        if len(self.cache) >= MAX_CACHED_RESPONSES:
+            self.cache.clear()
+        self.cache[key] = response
+        return response
+
+    def _build(self, method, target, keep_alive):
+        if method not in (b"GET", b"HEAD"):
+            return http_response(405, b'{"error": "method not allowed"}', keep_alive)
+        parts = urlsplit(target.decode("latin-1"))
+        query = parse_qs(parts.query)
+
+        if parts.path == "/health":
+            return http_response(200, b'{"status": "ok"}', keep_alive)
+
+        if parts.path == "/weather":
+            city = unquote_plus(query.get("city", [""])[0])
+            if not city:
+                return http_response(400, b'{"error": "city is required"}', keep_alive)
+            body = self.fixtures.weather(city)
+            if body is None:
+                return http_response(404, b'{"error": "City not found"}', keep_alive)
+            return http_response(200, json.dumps(body).encode("utf-8"), keep_alive)
+
+        if parts.path == "/search":
+            results = self.fixtures.search(unquote_plus(query.get("q", [""])[0]))
+            return http_response(200, json.dumps(results).encode("utf-8"), keep_alive)
+
+        if parts.path == "/v1/forecast":
+            try:
+                lat = float(query["latitude"][0])
+                lon = float(query["longitude"][0])
+            except (KeyError, ValueError):
+                return http_response(400, b'{"error": true, "reason": "latitude and longitude required"}', keep_alive)
+            body = self.fixtures.forecast_for(lat, lon)
+            return http_response(200, json.dumps(body).encode("utf-8"), keep_alive)
+
+        return http_response(404, b'{"error": "not found"}', keep_alive)
+
+class StubProtocol(asyncio.Protocol):
+    def __init__(self, app):
+        self.app = app
+        self.buffer = b""
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self.buffer += data
+        out = []
+        while True:
+            end = self.buffer.find(b"\r\n\r\n")
+            if end < 0:
+                if len(self.buffer) > MAX_HEADER_BYTES:
+                    out.append(http_response(431, b"{}", keep_alive=False))
+                    self._flush(out, close=True)
+                    return
+                break
+            head = self.buffer[:end]
+            lines = head.split(b"\r\n")
+            try:
+                method, target, version = lines[0].split(b" ", 2)
+            except ValueError:
+                out.append(http_response(400, b"{}", keep_alive=False))
+                self._flush(out, close=True)
+                return
+
+            body_len = 0
+            connection = b""
+            for line in lines[1:]:
+                name, _, value = line.partition(b":")
+                name = name.strip().lower()
+                if name == b"content-length":
+                    body_len = int(value.strip()) if value.strip().isdigit() else 0
+                elif name == b"connection":
+                    connection = value.strip().lower()
+            if len(self.buffer) < end + 4 + body_len:
+                break
+            self.buffer = self.buffer[end + 4 + body_len:]
+
+            keep_alive = connection != b"close" if version == b"HTTP/1.1" else connection == b"keep-alive"
+            response = self.app.respond(method, target, keep_alive)
+            if method == b"HEAD":
+                response = response[:response.find(b"\r\n\r\n") + 4]
+            out.append(response)
+            if not keep_alive:
+                self._flush(out, close=True)
+                return
+        self._flush(out)
+
+    def _flush(self, out, close=False):
+        # Gepipelinede antwoorden in één write
+        if self.app.delay:
+            asyncio.get_running_loop().call_later(self.app.delay, self._write, out, close)
+        else:
+            self._write(out, close)
+
+    def _write(self, out, close):
+        if self.transport.is_closing():
+            return
+        if out:
+            self.transport.write(b"".join(out))
+        if close:
+            self.transport.close()
+
+async def serve(host="127.0.0.1", port=8080, fixtures=None, delay=0.0):
+    app = WeatherStubApp(fixtures or WeatherFixtures(), delay)
+    loop = asyncio.get_running_loop()
+    server = await loop.create_server(lambda: StubProtocol(app), host, port, backlog=1024)
+    return server, app
+
+def start_background(fixtures=None, delay=0.0, host="127.0.0.1"):
+    # Stand-in op een vrije poort in een eigen event loop (daemon-thread); geeft (base_url, stop) terug
+    loop = asyncio.new_event_loop()
+    server, _ = loop.run_until_complete(serve(host, 0, fixtures, delay))
+    port = server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, name="weather-stub", daemon=True)
+    thread.start()
+
+    def stop():
+        if not thread.is_alive():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        loop.close()
+
+    return f"http://{host}:{port}", stop
+
+UPSTREAM_HOSTS = ("nominatim.openstreetmap.org", "api.open-meteo.com")
+CORS_HEADERS = {"Access-Control-Allow-Origin": "*", "Content-Type": "application/json"}
+
+def route_upstreams(page, fixtures=None, latency_ms=0.0):
+    # Playwright: browser-calls naar Nominatim en Open-Meteo beantwoorden uit de fixtures,
+    # met optioneel een vaste extra vertraging per request. Geeft tellers per host terug.
+    fixtures = fixtures or WeatherFixtures()
+    served = {host: 0 for host in UPSTREAM_HOSTS}
+    stand_in = None
+    if latency_ms:
+        # Vertraging in de stand-in, niet in de handler: page.wait_for_timeout zou de
+        # route-afhandeling van Playwright per request serieel ophouden
+        stand_in, stop = start_background(fixtures, latency_ms / 1000)
+        page.on("close", lambda _: stop())
+
+    def handle(route):
+        parts = urlsplit(route.request.url)
+        served[parts.hostname] += 1
+        if stand_in:
+            response = route.fetch(url=stand_in + parts.path + (f"?{parts.query}" if parts.query else ""))
+            route.fulfill(response=response, headers=CORS_HEADERS)
+            return
+        query = parse_qs(parts.query)
+        if parts.hostname == "nominatim.openstreetmap.org" and parts.path == "/search":
+            status, body = 200, fixtures.search(query.get("q", [""])[0])
+        elif parts.hostname == "api.open-meteo.com" and parts.path == "/v1/forecast":
+            try:
+                status, body = 200, fixtures.forecast_for(query["latitude"][0], query["longitude"][0])
+            except (KeyError, ValueError):
+                status, body = 400, {"error": True, "reason": "latitude and longitude required"}
+        else:
+            status, body = 404, {"error": "not found"}
+        route.fulfill(status=status, headers=CORS_HEADERS, body=json.dumps(body))
+
+    for host in UPSTREAM_HOSTS:
+        page.route(f"https://{host}/**", handle)
+    return served
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="Extra vertraging per antwoord (ms)")
+    args = parser.parse_args()
+
+    fast = install_fast_loop()
+
+    async def main():
+        server, app = await serve(args.host, args.port, delay=args.delay_ms / 1000)
+        print(f"🧪 Weather stand-in op http://{args.host}:{args.port} "
+              f"({len(app.fixtures.places)} steden, {'uvloop' if fast else 'asyncio'})")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass